@@ -0,0 +1,162 @@
+"""Command line runner for all the Advent of Code solutions"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import partial
+import sys
+import time
+
+import click
+
+import bench
+import cache
+import profiling
+from get_input import get_input, prefetch
+from harness import YEAR, discover, run_day
+
+
+def table(results, parts):
+    columns = [f"part{part}" for part in parts]
+    header = ["day"] + columns + ["parse"] + [f"{c} (s)" for c in columns]
+    rows = [header]
+    for result in results:
+        rows.append(
+            [f"{result.day:02}"]
+            + [str(result.answers.get(c, "")) for c in columns]
+            + [f"{result.times.get(c, 0):.4f}"
+               f"{'*' if c in result.cached else ''}"
+               for c in ["parse"] + columns]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) for cell, width in zip(row, widths))
+        for row in rows
+    )
+
+
+def select(days):
+    """Check requested days exist, defaulting to every day found"""
+    available = discover()
+    if missing := set(days) - set(available):
+        raise click.BadParameter(f"No solution for day(s) {sorted(missing)}")
+    return sorted(days or available)
+
+
+@click.group()
+def cli():
+    """Advent of Code 2025 solutions"""
+
+
+@cli.command()
+@click.argument("days", nargs=-1, type=int)
+@click.option("--part", "-p", "parts", type=click.IntRange(1, 2),
+              multiple=True, help="Parts to run (default both)")
+@click.option("--workers", "-j", type=int, default=None,
+              help="Worker processes (default one per core)")
+@click.option("--timeout", "-t", type=float, default=None,
+              help="Seconds allowed for each parse and part")
+@click.option("--cache/--no-cache", "use_cache", default=True,
+              show_default=True,
+              help="Reuse parsed inputs and answers from earlier runs")
+@click.option("--clear-cache", is_flag=True, help="Empty the cache first")
+def run(days, parts, workers, timeout, use_cache, clear_cache):
+    """Run DAYS (default all) across a process pool and tabulate answers
+
+    Times marked * were read from the cache.
+    """
+    days = select(days)
+    if clear_cache:
+        with closing(cache.Cache()) as store:
+            store.clear()
+    parts = sorted(set(parts or (1, 2)))
+    prefetch(days, [YEAR])
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(
+            partial(run_day, parts=parts, timeout=timeout,
+                    cache=cache.CACHE if use_cache else None),
+            days))
+    click.echo(table(results, parts))
+    click.echo(f"Total wall time: {time.perf_counter() - start:.3f}s")
+
+
+@cli.command("bench")
+@click.argument("days", nargs=-1, type=int)
+@click.option("--repeat", "-r", type=int, default=5, show_default=True)
+@click.option("--warmup", "-w", type=int, default=1, show_default=True)
+@click.option("--scale", "-s", "scales", type=int, multiple=True,
+              help="Also time inputs repeated this many times")
+@click.option("--timeout", "-t", type=float, default=None,
+              help="Skip any single run taking longer than this")
+@click.option("--baseline", "-b", default=bench.BASELINE, show_default=True)
+@click.option("--threshold", type=float, default=0.25, show_default=True,
+              help="Fractional slowdown that counts as a regression")
+@click.option("--save", is_flag=True, help="Record results as the baseline")
+def bench_command(days, repeat, warmup, scales, timeout, baseline, threshold,
+                  save):
+    """Time DAYS (default all) and compare against the stored baseline"""
+    days = select(days)
+    prefetch(days, [YEAR])
+    results = {}
+    for day in days:
+        text = get_input(day, YEAR)
+        inputs = {f"{day:02}": text}
+        if day in bench.SCALERS:
+            for factor in scales:
+                inputs[f"{day:02}x{factor}"] = bench.SCALERS[day](text, factor)
+        for key, text in inputs.items():
+            results[key] = bench.bench_day(day, text, repeat, warmup, timeout)
+            click.echo(f"{key:>6}  " + "  ".join(
+                f"{name} {seconds:.4f}s"
+                for name, seconds in results[key].items()))
+
+    if save:
+        bench.write_baseline(results, baseline)
+        return
+    slower = bench.regressions(
+        results, bench.read_baseline(baseline), threshold)
+    for key, name, old, new in slower:
+        click.echo(f"Regression in {key} {name}: {old:.4f}s -> {new:.4f}s "
+                   f"({new / old - 1:+.0%})", err=True)
+    if slower:
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("days", nargs=-1, type=int)
+@click.option("--profiler", type=click.Choice(["cprofile", "sample"]),
+              default="cprofile", show_default=True,
+              help="cprofile writes .prof files, "
+                   "sample writes flamegraph stacks")
+@click.option("--out", "-o", "out_dir", default="profiles", show_default=True)
+@click.option("--interval", type=float, default=0.001, show_default=True,
+              help="Seconds of CPU time between samples")
+@click.option("--top", "-n", type=int, default=10, show_default=True)
+def profile(days, profiler, out_dir, interval, top):
+    """Profile DAYS (default all), listing the hottest functions"""
+    days = select(days)
+    prefetch(days, [YEAR])
+    for day in days:
+        hottest = profiling.profile_day(
+            day, get_input(day, YEAR), profiler, out_dir, interval, top)
+        for name, functions in hottest.items():
+            click.echo(f"day{day:02} {name}:  self (s)  total (s)")
+            for function, own, total in functions:
+                click.echo(f"  {own:10.4f} {total:10.4f}  {function}")
+
+
+@cli.command()
+@click.argument("days", nargs=-1, type=int)
+@click.option("--top", "-n", type=int, default=5, show_default=True)
+def importtime(days, top):
+    """Report how long each of DAYS (default all) takes to import"""
+    for day in select(days):
+        (name, _, total), *rows = profiling.import_times(f"day{day:02}")
+        flag = "  OVER BUDGET" if total > profiling.IMPORT_BUDGET else ""
+        click.echo(f"{name}: {total * 1000:.1f}ms{flag}")
+        for imported, _, cumulative in rows[:top]:
+            click.echo(f"  {cumulative * 1000:8.1f}ms  {imported}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,134 @@
+"""Benchmarks of each day's parse, part1 and part2 with stored baselines"""
+
+from copy import deepcopy
+import json
+import math
+import statistics
+import time
+
+from harness import load, module, time_limit
+
+BASELINE = "bench_baseline.json"
+
+
+def repeat_items(seperator):
+    def scale(text, factor):
+        items = [item for item in text.strip().split(seperator) if item != '']
+        return seperator.join(items * factor)
+    return scale
+
+
+# Days whose answers are sums over independent lines, so repeating the
+# input is a fair way to make a bigger one
+SCALERS = {
+    1: repeat_items('\n'),
+    2: repeat_items(','),
+    3: repeat_items('\n'),
+    10: repeat_items('\n'),
+}
+
+
+def measure(func, data=None, repeat=5, warmup=1, timeout=None):
+    """Median seconds for func(data) over repeat runs after warmup runs
+
+    Each run gets its own copy of data since some parts consume it.
+    """
+    times = []
+    for run in range(warmup + repeat):
+        args = deepcopy(data)
+        start = time.perf_counter()
+        with time_limit(timeout):
+            func(args)
+        if run >= warmup:
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_day(day, text, repeat=5, warmup=1, timeout=None):
+    """Time parse, part1 and part2 of a day, skipping unsolved parts
+
+    Stages that hit the timeout are recorded as taking forever, and
+    nothing is left to time once parse does.
+    """
+    day_module = module(day)
+    try:
+        times = {"parse": measure(
+            lambda text: load(day_module, text), text, repeat, warmup,
+            timeout)}
+    except TimeoutError:
+        return {"parse": math.inf}
+    data = load(day_module, text)
+    # Days can offer VARIANTS, other implementations of a part to compare
+    parts = {name: getattr(day_module, name) for name in ("part1", "part2")}
+    parts.update(getattr(day_module, "VARIANTS", {}))
+    for name, func in parts.items():
+        try:
+            times[name] = measure(func, data, repeat, warmup, timeout)
+        except NotImplementedError:
+            continue
+        except TimeoutError:
+            times[name] = math.inf
+    return times
+
+
+def regressions(current, baseline, threshold):
+    """(key, name, old, new) of every time more than threshold slower
+
+    A baselined stage missing from a run of the same key counts as
+    infinitely slow, as does one that timed out.
+    """
+    slower = []
+    for key, times in current.items():
+        old_times = baseline.get(key, {})
+        for name in {**old_times, **times}:
+            old = old_times.get(name)
+            new = times.get(name, math.inf)
+            if old is not None and new > old * (1 + threshold):
+                slower.append((key, name, old, new))
+    return slower
+
+
+def read_baseline(path=BASELINE):
+    try:
+        with open(path) as file_handle:
+            return json.load(file_handle)
+    except FileNotFoundError:
+        return {}
+
+
+def write_baseline(results, path=BASELINE):
+    baseline = read_baseline(path)
+    baseline.update(results)
+    with open(path, "w") as file_handle:
+        json.dump(baseline, file_handle, indent=2, sort_keys=True)
+
+
+def test_regressions():
+    baseline = {"01": {"parse": 1.0, "part1": 1.0}, "01x10": {"part1": 5.0}}
+    current = {"01": {"parse": 1.1, "part1": 1.5, "part2": 9.0},
+               "01x10": {"part1": 4.0}}
+    assert regressions(current, baseline, 0.2) == [("01", "part1", 1.0, 1.5)]
+    baseline = {"10": {"parse": 0.1, "part1": 0.5, "part2": 1.0}}
+    current = {"10": {"parse": 0.1, "part1": math.inf}}
+    assert regressions(current, baseline, 0.25) == [
+        ("10", "part1", 0.5, math.inf), ("10", "part2", 1.0, math.inf)]
+
+
+def test_parse_timeout(monkeypatch):
+    def load(day_module, text):
+        raise TimeoutError
+    monkeypatch.setattr("bench.load", load)
+    times = bench_day(10, module(10).TEST1, repeat=1, warmup=0)
+    assert times == {"parse": math.inf}
+    baseline = {"10": {"parse": 0.1, "part1": 0.5}}
+    assert regressions({"10": times}, baseline, 0.25) == [
+        ("10", "parse", 0.1, math.inf), ("10", "part1", 0.5, math.inf)]
+
+
+def test_variants():
+    times = bench_day(10, module(10).TEST1, repeat=1, warmup=0)
+    assert set(times) == {"parse", "part1", "part2", "part2_linprog"}
+
+
+def test_scale():
+    assert SCALERS[2]("1-2,3-4,", 2) == "1-2,3-4,1-2,3-4"
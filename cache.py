@@ -0,0 +1,161 @@
+"""Persistent cache of parsed inputs and answers
+
+Raw inputs already live in get_input's InputStore. Parsed inputs and
+answers are keyed on the sha256 of the input together with the sha256 of
+the day's source and the local modules it imports, such as get_input, so
+editing any of them misses the cache. Least recently
+used entries are evicted once the cache grows past its size limit.
+"""
+
+import ast
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+
+CACHE = ".AoC-cache.sqlite"
+MAX_BYTES = 256 << 20
+MISSING = object()
+
+
+def digest(data):
+    if isinstance(data, str):
+        data = data.encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def local_sources(day_module):
+    """Paths of day_module's source and every local module it imports
+
+    Imports are followed recursively, including those inside functions,
+    as far as modules that sit next to day_module.
+    """
+    root = os.path.dirname(os.path.abspath(day_module.__file__))
+    paths, pending = set(), [os.path.abspath(day_module.__file__)]
+    while pending:
+        if (path := pending.pop()) in paths:
+            continue
+        paths.add(path)
+        with open(path, "rb") as file_handle:
+            tree = ast.parse(file_handle.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                local = os.path.join(root, f"{name.split('.')[0]}.py")
+                if os.path.exists(local):
+                    pending.append(local)
+    return sorted(paths)
+
+
+def source_digest(day_module):
+    """sha256 over the sources of day_module and its local imports"""
+    hasher = hashlib.sha256()
+    for path in local_sources(day_module):
+        hasher.update(os.path.basename(path).encode() + b"\0")
+        with open(path, "rb") as file_handle:
+            hasher.update(file_handle.read())
+    return hasher.hexdigest()
+
+
+class Cache:
+    def __init__(self, path=CACHE, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, layer TEXT, value BLOB,"
+            " size INTEGER, used REAL)"
+        )
+
+    @staticmethod
+    def key(layer, input_digest, source, name=""):
+        return digest(f"{layer}:{input_digest}:{source}:{name}")
+
+    def get(self, key):
+        """The cached value for key, or MISSING"""
+        row = self.db.execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return MISSING
+        with self.db:
+            self.db.execute("UPDATE entries SET used = ? WHERE key = ?",
+                            (time.time(), key))
+        return pickle.loads(zlib.decompress(row[0]))
+
+    def put(self, key, layer, value):
+        """Store value, silently skipping anything that can't be pickled"""
+        try:
+            data = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, layer, data, len(data), time.time()))
+        self.evict()
+
+    def size(self):
+        return self.db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        """Drop least recently used entries until under max_bytes"""
+        excess = self.size() - self.max_bytes
+        if excess <= 0:
+            return
+        keys = []
+        for key, size in self.db.execute(
+                "SELECT key, size FROM entries ORDER BY used"):
+            keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        with self.db:
+            self.db.executemany("DELETE FROM entries WHERE key = ?", keys)
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM entries")
+
+    def close(self):
+        self.db.close()
+
+
+def test_cache(tmp_path):
+    cache = Cache(tmp_path / "cache.sqlite", max_bytes=200)
+    first = Cache.key("parse", digest("input"), "source")
+    assert first != Cache.key("parse", digest("input"), "changed")
+    assert cache.get(first) is MISSING
+    cache.put(first, "parse", {1 + 2j, 3j})
+    assert cache.get(first) == {1 + 2j, 3j}
+
+    # Filling the cache past max_bytes evicts the least recently used
+    time.sleep(0.01)
+    second = Cache.key("answer", "a", "b")
+    cache.put(second, "answer", bytes(range(50)))
+    cache.get(first)
+    cache.put(Cache.key("answer", "c", "d"), "answer", bytes(range(100, 190)))
+    assert cache.get(second) is MISSING
+    assert cache.get(first) == {1 + 2j, 3j}
+    cache.put(Cache.key("x", "y", "z"), "parse", lambda: None)
+    assert cache.size() <= 200
+
+
+def test_source_digest(tmp_path, monkeypatch):
+    (tmp_path / "helper.py").write_text("VALUE = 1\n")
+    (tmp_path / "day99.py").write_text(
+        "import os\n\n\ndef part1(data):\n    from helper import VALUE\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import day99
+    assert [os.path.basename(path) for path in local_sources(day99)] == [
+        "day99.py", "helper.py"]
+    before = source_digest(day99)
+    (tmp_path / "helper.py").write_text("VALUE = 2\n")
+    assert source_digest(day99) != before
@@ -1,6 +1,8 @@
 """Advent of Code Day 1 Solution."""
 
-from get_input import get_input, line_parser
+from get_input import chunk_stream, get_input, line_parser
+
+CHUNK = 1 << 16
 
 
 def dial(sequence: list[int], position=50, size=100):
@@ -10,18 +12,62 @@ def dial(sequence: list[int], position=50, size=100):
         position %= size
 
 
+def dial_counts(chunks, position=50, size=100) -> tuple[int, int]:
+    """Zero hits and wraps of the dial over chunks of rotations
+
+    Equivalent to running dial over the concatenated chunks, but each chunk
+    is a single cumulative sum so only one chunk is in memory at a time.
+    """
+    import numpy as np
+
+    zeros = wraps = 0
+    for chunk in chunks:
+        moves = np.asarray(chunk, dtype=np.int64)
+        if len(moves) == 0:
+            continue
+        ends = np.cumsum(moves) + position
+        # Each rotation starts from where the last one left the dial
+        starts = np.empty_like(ends)
+        starts[0] = position
+        starts[1:] = ends[:-1] % size
+        turned = starts + moves
+        zeros += int(np.count_nonzero(turned % size == 0))
+        wraps += int(np.abs(turned // size).sum())
+        position = int(ends[-1] % size)
+    return zeros, wraps
+
+
+def batched(rows, size=CHUNK):
+    return (rows[i:i+size] for i in range(0, len(rows), size))
+
+
 def part1(rows):
-    return sum(1 if p % 100 == 0 else 0 for p in dial(rows))
+    return dial_counts(batched(rows))[0]
 
 
 def part2(rows):
-    return sum(abs(p // 100) for p in dial(rows))
+    return dial_counts(batched(rows))[1]
 
 
 def parse(line):
     return int(line[1:]) * (1 if line[0] == 'R' else -1)
 
 
+def parse_chunk(chunk: bytes):
+    import numpy as np
+    return np.array(
+        chunk.replace(b'L', b'-').replace(b'R', b'').split(), dtype=np.int64)
+
+
+def solve_file(file_name, size=CHUNK) -> tuple[int, int]:
+    """Both parts for a file of rotations of any size, size lines at a time"""
+    return dial_counts(chunk_stream(file_name, parse=parse_chunk, size=size))
+
+
+def load(text):
+    return line_parser(text, parse=parse)
+
+
 TEST1 = """
 L68
 L30
@@ -44,7 +90,17 @@ def test_part2():
     assert part2(line_parser(TEST1, parse=parse)) == 6
 
 
+def test_dial_counts(tmp_path):
+    import random
+    rows = [random.randint(-1000, 1000) for _ in range(1000)]
+    expected = (sum(1 for p in dial(rows) if p % 100 == 0),
+                sum(abs(p // 100) for p in dial(rows)))
+    assert dial_counts(batched(rows, 7)) == expected
+    (file_name := tmp_path / "input.txt").write_text(TEST1)
+    assert solve_file(file_name, size=3) == (3, 6)
+
+
 if __name__ == "__main__":
-    LINES = line_parser(get_input(day=1, year=2025), parse=parse)
+    LINES = load(get_input(day=1, year=2025))
     print(f"Part 1: {part1(LINES)}")
     print(f"Part 2: {part2(LINES)}")
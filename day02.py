@@ -1,21 +1,148 @@
 """Advent of Code Day 2 Solution."""
 
 from get_input import get_input, line_parser
-from functools import cache
+from bisect import bisect_left, bisect_right
+import heapq
 
 
-def part1(codes):
+def multiplier(length: int, block: int) -> int:
+    """Multiplying a block digits long number by this repeats it to length"""
+    return (10**length - 1) // (10**block - 1)
+
+
+def divisors(length: int) -> list[int]:
+    """Block sizes that repeat at least twice to make length digits"""
+    return [size for size in range(1, length // 2 + 1) if length % size == 0]
+
+
+def blocks(lo: int, hi: int, length: int, block: int) -> tuple[int, int, int]:
+    """Multiplier and the first and last blocks repeating into [lo, hi]"""
+    m = multiplier(length, block)
+    first = max(10**(block - 1), -(-lo // m))
+    last = min(10**block - 1, hi // m)
+    return m, first, last
+
+
+def period_sum(lo: int, hi: int, length: int, block: int) -> int:
+    """Sum of length digit numbers in [lo, hi] that repeat a block"""
+    m, first, last = blocks(lo, hi, length, block)
+    if first > last:
+        return 0
+    return m * (first + last) * (last - first + 1) // 2
+
+
+def invalid_sum(lo: int, hi: int, exact: bool = False) -> int:
+    """Sum of IDs in [lo, hi] made of a repeated block of digits
+
+    With exact only IDs that are one block repeated twice count. Numbers
+    repeating a smaller block (111111 is 1, 11 and 111 repeated) are
+    counted once, under their shortest block.
+    """
     total = 0
-    for before, after in codes:
-        for n in range(before, after + 1):
-            s = str(n)
-            # repeats doesn't cover 999 or 111
-            if s[:len(s)//2] == s[len(s)//2:]:
-                total += n
+    for length in range(len(str(lo)), len(str(hi)) + 1):
+        if exact:
+            if length % 2 == 0:
+                total += period_sum(lo, hi, length, length // 2)
+            continue
+        primitive = {}
+        for block in divisors(length):
+            primitive[block] = period_sum(lo, hi, length, block) - \
+                sum(primitive[smaller] for smaller in divisors(block))
+        total += sum(primitive.values())
     return total
 
 
-@cache
+def _repeated(lo, hi, length, block, exact):
+    m, first, last = blocks(lo, hi, length, block)
+    periods = [] if exact else [multiplier(block, e) for e in divisors(block)]
+    for b in range(first, last + 1):
+        if not any(b % period == 0 for period in periods):
+            yield b * m
+
+
+def invalid_ids(lo: int, hi: int, exact: bool = False):
+    """The IDs invalid_sum adds up, in increasing order"""
+    for length in range(len(str(lo)), len(str(hi)) + 1):
+        if exact:
+            sizes = [length // 2] if length % 2 == 0 else []
+        else:
+            sizes = divisors(length)
+        yield from heapq.merge(
+            *(_repeated(lo, hi, length, size, exact) for size in sizes))
+
+
+class InvalidIndex:
+    """Every invalid ID up to a number of digits, with prefix sums
+
+    Sums over any range are then two bisections, and batches of ranges two
+    vectorized searches. IDs are kept to 18 digits so they fit in int64;
+    prefix sums fall back to Python ints once they would overflow.
+    """
+    VARIANTS = {"exact": True, "any": False}
+
+    def __init__(self, digits: int, arrays: dict):
+        self.digits = digits
+        self.arrays = arrays
+
+    @classmethod
+    def build(cls, digits: int = 12) -> "InvalidIndex":
+        import numpy as np
+        if not 1 <= digits <= 18:
+            raise ValueError(f"Can only index 1 to 18 digits, not {digits}")
+        arrays = {}
+        for name, exact in cls.VARIANTS.items():
+            ids = np.fromiter(invalid_ids(1, 10**digits - 1, exact),
+                              dtype=np.int64)
+            total = int(ids.sum(dtype=object)) if len(ids) else 0
+            dtype = np.int64 if total < 2**63 else object
+            prefix = np.zeros(len(ids) + 1, dtype=dtype)
+            np.cumsum(ids, out=prefix[1:], dtype=prefix.dtype)
+            arrays[f"{name}_ids"] = ids
+            arrays[f"{name}_prefix"] = prefix
+        return cls(digits, arrays)
+
+    def save(self, path):
+        import numpy as np
+        np.savez(path, digits=self.digits, **self.arrays)
+
+    @classmethod
+    def load(cls, path) -> "InvalidIndex":
+        import numpy as np
+        with np.load(path, allow_pickle=True) as data:
+            arrays = {name: data[name] for name in data.files
+                      if name != "digits"}
+            return cls(int(data["digits"]), arrays)
+
+    def _check(self, hi):
+        if hi >= 10**self.digits:
+            raise ValueError(f"{hi} is beyond the {self.digits} digit index")
+
+    def sum(self, lo: int, hi: int, exact: bool = False) -> int:
+        """invalid_sum(lo, hi, exact) from the index"""
+        self._check(hi)
+        name = "exact" if exact else "any"
+        ids = self.arrays[f"{name}_ids"]
+        prefix = self.arrays[f"{name}_prefix"]
+        return int(
+            prefix[bisect_right(ids, hi)] - prefix[bisect_left(ids, lo)])
+
+    def sums(self, ranges, exact: bool = False):
+        """invalid_sum for every (lo, hi) row of ranges at once"""
+        import numpy as np
+        ranges = np.asarray(ranges, dtype=np.int64).reshape(-1, 2)
+        if len(ranges):
+            self._check(int(ranges[:, 1].max()))
+        name = "exact" if exact else "any"
+        ids, prefix = self.arrays[f"{name}_ids"], self.arrays[f"{name}_prefix"]
+        return prefix[np.searchsorted(ids, ranges[:, 1], side="right")] - \
+            prefix[np.searchsorted(ids, ranges[:, 0], side="left")]
+
+
+def part1(codes):
+    return sum(invalid_sum(before, after, exact=True)
+               for before, after in codes)
+
+
 def repeats(string: str) -> bool:
     length = len(string)
     for size in range(1, length // 2 + 1):
@@ -28,13 +155,7 @@ def repeats(string: str) -> bool:
 
 
 def part2(codes):
-    total = 0
-    for before, after in codes:
-        for num in range(before, after + 1):
-            string = str(num)
-            if repeats(string):
-                total += num
-    return total
+    return sum(invalid_sum(before, after) for before, after in codes)
 
 
 def parse(line):
@@ -42,6 +163,10 @@ def parse(line):
     return (int(before), int(after))
 
 
+def load(text):
+    return line_parser(text, parse=parse, seperator=',')
+
+
 TEST1 = "11-22,95-115,998-1012,1188511880-1188511890,222220-222224,"\
     "1698522-1698528,446443-446449,38593856-38593862,565653-565659," \
     "824824821-824824827,2121212118-2121212124"
@@ -55,8 +180,32 @@ def test_part2():
     assert part2(line_parser(TEST1, parse=parse, seperator=',')) == 4174379265
 
 
+def test_invalid_sum():
+    import random
+    for _ in range(50):
+        lo = random.randint(1, 2_000_000)
+        hi = lo + random.randint(0, 5_000)
+        numbers = range(lo, hi + 1)
+        doubled = [n for n in numbers
+                   if (s := str(n))[:len(s)//2] == s[len(s)//2:]]
+        repeated = [n for n in numbers if repeats(str(n))]
+        assert invalid_sum(lo, hi, exact=True) == sum(doubled)
+        assert invalid_sum(lo, hi) == sum(repeated)
+        assert list(invalid_ids(lo, hi, exact=True)) == doubled
+        assert list(invalid_ids(lo, hi)) == repeated
+
+
+def test_invalid_index(tmp_path):
+    InvalidIndex.build(6).save(tmp_path / "index.npz")
+    index = InvalidIndex.load(tmp_path / "index.npz")
+    ranges = [(1, 999_999), (11, 22), (95, 115), (998, 1012), (222220, 222224)]
+    for exact in (True, False):
+        expected = [invalid_sum(lo, hi, exact) for lo, hi in ranges]
+        assert [index.sum(lo, hi, exact) for lo, hi in ranges] == expected
+        assert list(index.sums(ranges, exact)) == expected
+
+
 if __name__ == "__main__":
-    LINES = line_parser(get_input(day=2, year=2025),
-                        parse=parse, seperator=',')
+    LINES = load(get_input(day=2, year=2025))
     print(f"Part 1: {part1(LINES)}")
     print(f"Part 2: {part2(LINES)}")
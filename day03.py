@@ -4,17 +4,62 @@ from get_input import get_input, line_parser
 
 
 def joltage(row, size):
+    """Largest size digit number made of row's digits in their order
+
+    Monotonic stack: a digit knocks out smaller ones before it while there
+    are still digits to spare, so each digit is pushed and popped once.
+    """
+    spare = len(row) - size
+    if spare < 0:
+        raise ValueError(f"Can't pick {size} digits from {len(row)}")
+    stack = []
+    for digit in row:
+        while spare > 0 and stack and stack[-1] < digit:
+            stack.pop()
+            spare -= 1
+        stack.append(digit)
     joltage = 0
-    for i in range(size, 0, -1):
-        p, digit = max(
-            enumerate(row if i == 0 else row[:len(row)+1-i]),
-            key=lambda x: x[1]
-        )
+    for digit in stack[:size]:
         joltage = joltage * 10 + digit
-        row = row[p+1:]
     return joltage
 
 
+def batch_joltage(rows, size):
+    """joltage for every row at once, over a NumPy matrix of digits
+
+    Rows must all be the same length. For each row the next position of
+    each digit is tabulated, then every output digit is the largest one
+    whose next position leaves enough digits to finish.
+    """
+    import numpy as np
+
+    digits = np.array(rows, dtype=np.int8)
+    if digits.ndim != 2:
+        raise ValueError("Rows must all be the same length")
+    count, length = digits.shape
+    if size > length:
+        raise ValueError(f"Can't pick {size} digits from {length}")
+    following = np.full((count, 10, length + 1), length, dtype=np.int32)
+    columns = np.arange(length, dtype=np.int32)
+    for digit in range(10):
+        at = np.where(digits == digit, columns, length)
+        following[:, digit, :length] = np.minimum.accumulate(
+            at[:, ::-1], axis=1)[:, ::-1]
+
+    index = np.arange(count)
+    start = np.zeros(count, dtype=np.int64)
+    joltages = np.zeros(count, dtype=object)
+    for remaining in range(size, 0, -1):
+        chosen = np.full(count, -1, dtype=np.int8)
+        for digit in range(9, -1, -1):
+            position = following[index, digit, start]
+            pick = (chosen < 0) & (position <= length - remaining)
+            chosen[pick] = digit
+            start[pick] = position[pick] + 1
+        joltages = joltages * 10 + chosen.astype(object)
+    return joltages
+
+
 def part1(rows):
     return sum(joltage(row, 2) for row in rows)
 
@@ -27,6 +72,10 @@ def parse(line):
     return tuple(int(d) for d in line)
 
 
+def load(text):
+    return line_parser(text, parse=parse)
+
+
 TEST1 = """
 987654321111111
 811111111111119
@@ -43,7 +92,30 @@ def test_part2():
     assert part2(line_parser(TEST1, parse=parse)) == 3121910778619
 
 
+def test_joltage():
+    import random
+
+    def greedy(row, size):
+        value = 0
+        for i in range(size, 0, -1):
+            p, digit = max(enumerate(row[:len(row)+1-i]), key=lambda x: x[1])
+            value = value * 10 + digit
+            row = row[p+1:]
+        return value
+
+    rows = [tuple(random.randint(1, 9) for _ in range(40)) for _ in range(50)]
+    for size in (1, 12, 25, 40):
+        expected = [greedy(row, size) for row in rows]
+        assert [joltage(row, size) for row in rows] == expected
+        assert list(batch_joltage(rows, size)) == expected
+    import pytest
+    with pytest.raises(ValueError):
+        joltage((1, 2, 3), 5)
+    with pytest.raises(ValueError):
+        batch_joltage([(1, 2, 3)], 5)
+
+
 if __name__ == "__main__":
-    LINES = line_parser(get_input(day=3, year=2025), parse=parse)
+    LINES = load(get_input(day=3, year=2025))
     print(f"Part 1: {part1(LINES)}")
     print(f"Part 2: {part2(LINES)}")
@@ -1,34 +1,124 @@
 """Advent of Code Day 4 Solution."""
 
+from dataclasses import dataclass
 from get_input import get_input
 
 
-def find(rolls):
-    directions = (
-       1+-1j,  1+0j,  1+1j,
-       0+-1j,         0+1j,
-      -1+-1j, -1+0j, -1+1j
-    )
+DIRECTIONS = (
+   1+-1j,  1+0j,  1+1j,
+   0+-1j,         0+1j,
+  -1+-1j, -1+0j, -1+1j
+)
+
 
+def find(rolls):
     remove = set()
     for p in rolls:
-        if sum(1 for d in directions if p+d in rolls) < 4:
+        if sum(1 for d in DIRECTIONS if p+d in rolls) < 4:
             remove.add(p)
     return remove
 
 
+def peel(rolls) -> list[int]:
+    """How many rolls each round of part2 removes, until none can be
+
+    Neighbor counts are found once. Removing a roll only decrements its
+    neighbors, and those that drop below 4 are queued for the next round.
+    """
+    counts = {p: sum(1 for d in DIRECTIONS if p+d in rolls) for p in rolls}
+    current = [p for p, count in counts.items() if count < 4]
+    removed = set(current)
+    rounds = []
+    while current:
+        rounds.append(len(current))
+        queue = []
+        for p in current:
+            for d in DIRECTIONS:
+                if (n := p + d) not in counts or n in removed:
+                    continue
+                counts[n] -= 1
+                if counts[n] < 4:
+                    removed.add(n)
+                    queue.append(n)
+        current = queue
+    return rounds
+
+
+@dataclass(frozen=True)
+class Grid:
+    """Rolls as bits of one big int, row r column c at bit r*stride + c
+
+    Each row is followed by an always empty padding column so shifting by
+    one never carries a roll onto the next row.
+    """
+    cells: int
+    width: int
+    height: int
+
+    @property
+    def stride(self) -> int:
+        return self.width + 1
+
+    def neighbors(self, cells: int):
+        for shift in (1, self.stride - 1, self.stride, self.stride + 1):
+            yield cells << shift
+            yield cells >> shift
+
+
+def _add(counter: list[int], cells: int):
+    """Bit sliced ripple carry add of one bit per cell into counter"""
+    for i, bits in enumerate(counter):
+        counter[i], cells = bits ^ cells, bits & cells
+        if not cells:
+            return
+    counter.append(cells)
+
+
+def accessible(grid: Grid, cells: int = None) -> int:
+    """Rolls with fewer than four neighboring rolls, as bits"""
+    cells = grid.cells if cells is None else cells
+    counter = []
+    for shifted in grid.neighbors(cells):
+        _add(counter, shifted)
+    # Four or more is the third bit of the count or anything above it
+    crowded = 0
+    for bits in counter[2:]:
+        crowded |= bits
+    return cells & ~crowded
+
+
+def peel_bits(grid: Grid) -> list[int]:
+    """peel over the bit form, one shift of the whole grid per operation"""
+    cells = grid.cells
+    rounds = []
+    while remove := accessible(grid, cells):
+        rounds.append(remove.bit_count())
+        cells &= ~remove
+    return rounds
+
+
 def part1(rolls):
+    if isinstance(rolls, Grid):
+        return accessible(rolls).bit_count()
     return len(find(rolls))
 
 
 def part2(rolls):
-    start = len(rolls)
-    while len(to_remove := find(rolls)) > 0:
-        rolls -= to_remove
-    return start - len(rolls)
-
-
-def parse(diagram):
+    if isinstance(rolls, Grid):
+        return sum(peel_bits(rolls))
+    return sum(peel(rolls))
+
+
+def parse(diagram, bits=False):
+    if bits:
+        rows = diagram.strip().splitlines()
+        width = max(len(row) for row in rows)
+        flat = '.'.join(row.ljust(width, '.') for row in rows)
+        return Grid(
+            cells=int(flat[::-1].translate({ord('.'): '0', ord('@'): '1'}), 2),
+            width=width,
+            height=len(rows),
+        )
     grid = set()
     for r, row in enumerate(diagram.strip().splitlines()):
         for c, char in enumerate(row):
@@ -58,6 +148,21 @@ def test_part2():
     assert part2(parse(TEST1)) == 43
 
 
+def test_peel():
+    rolls = parse(TEST1)
+    rounds = []
+    while len(to_remove := find(rolls)) > 0:
+        rounds.append(len(to_remove))
+        rolls = rolls - to_remove
+    assert peel(parse(TEST1)) == rounds
+
+
+def test_bits():
+    grid = parse(TEST1, bits=True)
+    assert part1(grid) == 13
+    assert peel_bits(grid) == peel(parse(TEST1))
+
+
 if __name__ == "__main__":
     LINES = parse(get_input(day=4, year=2025))
     print(f"Part 1: {part1(LINES)}")
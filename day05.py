@@ -1,26 +1,126 @@
 """Advent of Code Day 5 Solution."""
-from get_input import get_input
+from bisect import bisect_left, bisect_right
+from get_input import get_input, line_stream
+from itertools import chain, islice
+
+
+class IntervalIndex:
+    """Inclusive ranges merged once into sorted, disjoint starts and ends"""
+
+    def __init__(self, ranges):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(ranges):
+            if self.ends and start <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+        self._arrays = None
+
+    def __contains__(self, value) -> bool:
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value <= self.ends[i]
+
+    def total(self) -> int:
+        """How many IDs the ranges cover"""
+        return sum(end - start + 1
+                   for start, end in zip(self.starts, self.ends))
+
+    def count(self, ids) -> int:
+        """How many of an array of IDs are in a range, in one searchsorted"""
+        import numpy as np
+        if self._arrays is None:
+            self._arrays = (np.array(self.starts, dtype=np.int64),
+                            np.array(self.ends, dtype=np.int64))
+        starts, ends = self._arrays
+        ids = np.asarray(ids, dtype=np.int64)
+        i = np.searchsorted(starts, ids, side="right") - 1
+        inside = (i >= 0) & (ids <= ends[np.maximum(i, 0)])
+        return int(np.count_nonzero(inside))
+
+    def count_stream(self, ids, chunk=1 << 16) -> int:
+        """count over an iterable of IDs, holding only chunk of them at once"""
+        import numpy as np
+        ids = iter(ids)
+        total = 0
+        while len(batch := np.fromiter(islice(ids, chunk), dtype=np.int64)):
+            total += self.count(batch)
+        return total
+
+
+class IntervalSet(IntervalIndex):
+    """IntervalIndex that IDs can be added to and removed from in ranges
+
+    Each change bisects to the ranges it touches and splices in their
+    replacement, keeping the covered total up to date as it goes.
+    """
+
+    def __init__(self, ranges=()):
+        super().__init__(ranges)
+        self.covered = super().total()
+
+    def total(self) -> int:
+        return self.covered
+
+    def _splice(self, lo, hi, starts, ends):
+        self.covered -= sum(e - s + 1 for s, e in
+                            zip(self.starts[lo:hi], self.ends[lo:hi]))
+        self.covered += sum(e - s + 1 for s, e in zip(starts, ends))
+        self.starts[lo:hi] = starts
+        self.ends[lo:hi] = ends
+        self._arrays = None
+
+    def add(self, start: int, end: int):
+        """Cover start to end inclusive, merging with touching ranges"""
+        lo = bisect_left(self.ends, start - 1)
+        hi = bisect_right(self.starts, end + 1)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self._splice(lo, hi, [start], [end])
+
+    def remove(self, start: int, end: int):
+        """Stop covering start to end inclusive, splitting ranges as needed"""
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo >= hi:
+            return
+        starts, ends = [], []
+        if self.starts[lo] < start:
+            starts.append(self.starts[lo])
+            ends.append(start - 1)
+        if self.ends[hi - 1] > end:
+            starts.append(end + 1)
+            ends.append(self.ends[hi - 1])
+        self._splice(lo, hi, starts, ends)
 
 
 def part1(recipes):
     ranges, ingredients = recipes
-    total = 0
-    for ingredient in ingredients:
-        for start, end in ranges:
-            if start <= ingredient <= end:
-                total += 1
-                break
-    return total
+    index = IntervalIndex(ranges)
+    return sum(1 for ingredient in ingredients if ingredient in index)
 
 
 def part2(recipes):
     ranges, _ = recipes
-    total = 0
-    last = 0
-    for start, end in sorted(ranges):
-        total += max(0, end - max(last, start - 1))
-        last = max(last, end)
-    return total
+    return IntervalIndex(ranges).total()
+
+
+def solve_file(file_name, chunk=1 << 16) -> tuple[int, int]:
+    """Both parts, streaming ingredient IDs out of the file"""
+    lines = line_stream(file_name, parse=lambda line: line)
+    ranges = []
+    for line in lines:
+        if "-" not in line:
+            ids = chain([line], lines)
+            break
+        start, end = map(int, line.split("-"))
+        ranges.append((start, end))
+    else:
+        ids = iter(())
+    index = IntervalIndex(ranges)
+    return index.count_stream(map(int, ids), chunk), index.total()
 
 
 def parse(text):
@@ -58,6 +158,40 @@ def test_part2():
     assert part2(parse(TEST1)) == 14
 
 
+def test_interval_index(tmp_path):
+    ranges, ingredients = parse(TEST1)
+    index = IntervalIndex(ranges)
+    assert (index.starts, index.ends) == ([3, 10], [5, 20])
+    assert index.count(ingredients) == 3
+    assert index.count_stream(iter(ingredients), chunk=4) == 3
+    (file_name := tmp_path / "input.txt").write_text(TEST1)
+    assert solve_file(file_name, chunk=2) == (3, 14)
+
+
+def test_interval_set():
+    import random
+    ranges, ingredients = parse(TEST1)
+    live = IntervalSet()
+    for start, end in ranges:
+        live.add(start, end)
+    assert live.total() == 14
+    assert sum(1 for i in ingredients if i in live) == 3
+
+    covered = set(range(3, 6)) | set(range(10, 21))
+    for _ in range(500):
+        start = random.randint(0, 100)
+        end = start + random.randint(0, 15)
+        if random.random() < 0.5:
+            live.add(start, end)
+            covered |= set(range(start, end + 1))
+        else:
+            live.remove(start, end)
+            covered -= set(range(start, end + 1))
+        assert live.total() == len(covered)
+        assert IntervalIndex(zip(live.starts, live.ends)).starts == live.starts
+    assert [i for i in range(120) if i in live] == sorted(covered)
+
+
 if __name__ == "__main__":
     LINES = parse(get_input(day=5, year=2025))
     print(f"Part 1: {part1(LINES)}")
@@ -1,41 +1,82 @@
 """Advent of Code Day 6 Solution."""
 
 from get_input import get_input
-from functools import reduce
+import math
+import mmap
+
+SPACE = ord(' ')
 
 
 def solve(oper, nums):
     if oper == '+':
-        return sum(int(n) for n in nums)
+        return sum(nums)
     elif oper == '*':
-        return reduce(lambda x, y:  x * int(y), nums, 1)
+        return math.prod(nums)
     raise ValueError(f"Unknown operator: {oper}")
 
 
-def part1(lines):
-    # Pivot on columns
-    pivot = zip(*[lines.split() for lines in lines])
-    return sum(solve(line[-1], line[:-1]) for line in pivot)
+def problems(buffer):
+    """Yield (operator, row numbers, column numbers) for each problem
+
+    Rows are located once by their offsets, then the buffer is read
+    column by column at those offsets. Nothing is transposed or split, so
+    only the current problem is ever held in memory.
+    """
+    rows = []
+    start = 0
+    while start < len(buffer):
+        end = buffer.find(b'\n', start)
+        end = len(buffer) if end == -1 else end
+        rows.append((start, end))
+        start = end + 1
+    lines = rows
+    *rows, (op_start, op_end) = lines
+    width = max(end - start for start, end in lines)
+
+    first = None
+    for col in range(width + 1):
+        blank = all(start + col >= end or buffer[start + col] == SPACE
+                    for start, end in lines)
+        if not blank:
+            first = col if first is None else first
+            continue
+        if first is None:
+            continue
+        oper = bytes(
+            buffer[op_start + first:min(op_start + col, op_end)]).strip()
+        across = [int(buffer[start + first:min(start + col, end)])
+                  for start, end in rows]
+        down = []
+        for c in range(first, col):
+            digits = bytes(buffer[start + c] for start, end in rows
+                           if start + c < end and buffer[start + c] != SPACE)
+            down.append(int(digits))
+        yield oper.decode(), across, down
+        first = None
 
 
-def part2(lines):
-    # Pivot on characters
-    pivot = list(reversed(list(zip(*lines))))
-    pivot.append([' ']*len(pivot[0]))
-    total = 0
-    queue = []
-    for line in pivot:
-        if any(c != ' ' for c in line):
-            queue.append(line)
-            continue
-        problem = ''.join(c for row in queue for c in row).strip()
-        total += solve(problem[-1], problem[:-1].split())
-        queue.clear()
-    return total
+def part1(sheet):
+    return sum(solve(oper, across) for oper, across, _ in problems(sheet))
+
+
+def part2(sheet):
+    return sum(solve(oper, down) for oper, _, down in problems(sheet))
+
+
+def solve_file(file_name) -> tuple[int, int]:
+    """Both parts in one pass over a memory map of the worksheet"""
+    with open(file_name, 'rb') as file_handle:
+        with mmap.mmap(file_handle.fileno(), 0,
+                       access=mmap.ACCESS_READ) as buffer:
+            totals = [0, 0]
+            for oper, across, down in problems(buffer):
+                totals[0] += solve(oper, across)
+                totals[1] += solve(oper, down)
+            return tuple(totals)
 
 
 def parse(text):
-    return tuple(text.strip('\n').splitlines())
+    return text.strip('\n').encode()
 
 
 TEST1 = (
@@ -54,6 +95,11 @@ def test_part2():
     assert part2(parse(TEST1)) == 3263827
 
 
+def test_solve_file(tmp_path):
+    (file_name := tmp_path / "input.txt").write_text(TEST1.rstrip())
+    assert solve_file(file_name) == (4277556, 3263827)
+
+
 if __name__ == "__main__":
     LINES = parse(get_input(day=6, year=2025))
     print(f"Part 1: {part1(LINES)}")
@@ -1,51 +1,97 @@
 """Advent of Code Day 7 Solution."""
 
+from array import array
 from get_input import get_input
-from collections import defaultdict
-
-
-def part1(field):
-    queue = [p for p, c in field.items() if c == 'S']
-    splits = set()
-    beam = set()
-    while queue:
-        p = queue.pop(0)
-        if p in beam or p not in field:
-            continue
-        if field[p] == '^':
-            splits.add(p)
-            queue.append(p+1j)
-            queue.append(p-1j)
-        else:
-            assert field[p] == '.' or field[p] == 'S'
-            beam.add(p)
-            queue.append(p+1)
-    return len(splits)
-
-
-def part2(field):
-    next_row = {p: 1 for p, c in field.items() if c == 'S'}
-    while next_row != {}:
-        row = next_row
-        next_row = defaultdict(int)
-        for p, v in row.items():
-            if p not in field:
-                continue
-            if field[p] == '^':
-                next_row[p+1+1j] += v
-                next_row[p+1-1j] += v
-            else:
-                assert field[p] == '.' or field[p] == 'S'
-                next_row[p+1] += v
-    return sum(row.values())
+import pickle
+
+
+def positions(row: str, char: str):
+    col = row.find(char)
+    while col != -1:
+        yield col
+        col = row.find(char, col + 1)
+
+
+def sweep(rows: tuple[str, ...]) -> tuple[int, int]:
+    """Splitters hit and timelines, from one pass down the manifold
+
+    beams holds how many timelines are in each column of the current row,
+    so nothing beyond the rows themselves grows with the field's height.
+    """
+    width = max(len(row) for row in rows)
+    beams = [0] * width
+    splits = 0
+    for row in rows:
+        for col in positions(row, 'S'):
+            beams[col] += 1
+        hits = [(col, beams[col]) for col in positions(row, '^') if beams[col]]
+        splits += len(hits)
+        for col, _ in hits:
+            beams[col] = 0
+        for col, count in hits:
+            if col > 0:
+                beams[col - 1] += count
+            if col + 1 < width:
+                beams[col + 1] += count
+    return splits, sum(beams)
+
+
+class Timelines:
+    """How many timelines leave the manifold from each cell
+
+    Built bottom up, so the count for a cell comes straight from the row
+    below it. Rows are int64 arrays, switching to lists of Python ints
+    only once a count no longer fits.
+    """
+
+    def __init__(self, table: list):
+        self.table = table
+
+    @classmethod
+    def build(cls, rows: tuple[str, ...]) -> "Timelines":
+        width = max(len(row) for row in rows)
+        below = array('q', [1] * width)
+        table = [None] * len(rows)
+        for r in range(len(rows) - 1, -1, -1):
+            current = below[:]
+            for col in positions(rows[r], '^'):
+                count = (below[col - 1] if col > 0 else 0) + \
+                    (below[col + 1] if col + 1 < width else 0)
+                try:
+                    current[col] = count
+                except OverflowError:
+                    current = list(current)
+                    current[col] = count
+            table[r] = below = current
+        return cls(table)
+
+    def __getitem__(self, cell: tuple[int, int]) -> int:
+        row, col = cell
+        return self.table[row][col]
+
+    def batch(self, cells) -> list[int]:
+        return [self.table[row][col] for row, col in cells]
+
+    def dump(self, path):
+        with open(path, 'wb') as file_handle:
+            pickle.dump(self.table, file_handle, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path) -> "Timelines":
+        with open(path, 'rb') as file_handle:
+            return cls(pickle.load(file_handle))
+
+
+def part1(rows):
+    return sweep(rows)[0]
+
+
+def part2(rows):
+    return sweep(rows)[1]
 
 
 def parse(text):
-    field = {}
-    for r, row in enumerate(text.strip().splitlines()):
-        for c, char in enumerate(row):
-            field[complex(r, c)] = char
-    return field
+    return tuple(text.strip().splitlines())
 
 
 TEST1 = """
@@ -76,6 +122,21 @@ def test_part2():
     assert part2(parse(TEST1)) == 40
 
 
+def test_timelines(tmp_path):
+    rows = parse(TEST1)
+    Timelines.build(rows).dump(tmp_path / "table.pickle")
+    table = Timelines.load(tmp_path / "table.pickle")
+    assert table[0, rows[0].index('S')] == 40
+    starts = [(0, col) for col in range(len(rows[0]))]
+    for start, count in zip(starts, table.batch(starts)):
+        field = list(rows)
+        field[0] = '.' * start[1] + 'S' + '.' * (len(rows[0]) - start[1] - 1)
+        assert count == sweep(field)[1]
+
+    deep = ('.^' * 80, '^.' * 80) * 80
+    assert isinstance(Timelines.build(deep).table[0], list)
+
+
 if __name__ == "__main__":
     LINES = parse(get_input(day=7, year=2025))
     print(f"Part 1: {part1(LINES)}")
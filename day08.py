@@ -1,8 +1,11 @@
 """Advent of Code Day 8 Solution."""
 
 from get_input import get_input, line_parser
+from collections import defaultdict
 from dataclasses import dataclass
-from itertools import combinations
+from disjoint_set import DisjointSet
+from itertools import combinations, product
+from math import isqrt, prod
 
 
 @dataclass(frozen=True)
@@ -20,39 +23,188 @@ class Node:
         return Node(*map(int, line.split(",")))
 
 
+class SpatialGrid:
+    """Points bucketed into a uniform grid of cubic cells
+
+    Pairs are produced nearest first, one band of distances at a time. Each
+    band only visits cells close enough to hold a pair in it, and the band
+    radius doubles until every pair has been produced.
+    """
+
+    def __init__(self, points: list[Node], cell: int = None):
+        self.points = points
+        if cell is None:
+            # Aim for about one point per cell
+            spans = [max(axis) - min(axis) + 1
+                     for axis in zip(*((p.x, p.y, p.z) for p in points))]
+            cell = max(1, round((prod(spans) / len(points)) ** (1 / 3)))
+        self.cell = cell
+        self.cells = defaultdict(list)
+        for i, p in enumerate(points):
+            self.cells[(p.x // cell, p.y // cell, p.z // cell)].append(i)
+
+    def gap(self, offset) -> int:
+        """Smallest squared distance between points in cells offset apart"""
+        return sum((max(0, abs(d) - 1) * self.cell) ** 2 for d in offset)
+
+    def neighbors(self, radius2: int):
+        """Pairs of cells that may hold points within sqrt(radius2), once each
+
+        Searches around each cell while the search cube is small, and pairs
+        up the occupied cells directly once that would be cheaper.
+        """
+        reach = isqrt(radius2) // self.cell + 1
+        if (2 * reach + 1) ** 3 // 2 < len(self.cells):
+            steps = range(-reach, reach + 1)
+            offsets = [offset for offset in product(steps, steps, steps)
+                       if offset >= (0, 0, 0) and self.gap(offset) <= radius2]
+            for key in self.cells:
+                for offset in offsets:
+                    other = tuple(k + d for k, d in zip(key, offset))
+                    if other in self.cells:
+                        yield key, other
+        else:
+            keys = list(self.cells)
+            for i, key in enumerate(keys):
+                for other in keys[i:]:
+                    offset = tuple(o - k for k, o in zip(key, other))
+                    if self.gap(offset) <= radius2:
+                        yield key, other
+
+    def band(self, lo: int, hi: int) -> list[tuple[int, int, int]]:
+        """Sorted (distance, i, j) for i < j with lo < distance <= hi"""
+        points = self.points
+        pairs = []
+        for key, other in self.neighbors(hi):
+            if key == other:
+                candidates = combinations(self.cells[key], 2)
+            else:
+                candidates = product(self.cells[key], self.cells[other])
+            for i, j in candidates:
+                if lo < (d := points[i].distance(points[j])) <= hi:
+                    pairs.append((d, min(i, j), max(i, j)))
+        pairs.sort()
+        return pairs
+
+    def pairs(self):
+        """Every (distance, i, j) pair, lazily, nearest first"""
+        remaining = len(self.points) * (len(self.points) - 1) // 2
+        lo, hi = -1, self.cell ** 2
+        while remaining > 0:
+            pairs = self.band(lo, hi)
+            remaining -= len(pairs)
+            yield from pairs
+            lo, hi = hi, hi * 4
+
+
+def spanning_tree(points: list[Node]) -> list[tuple[int, int, int]]:
+    """Euclidean minimum spanning tree edges (distance, i, j) in order
+
+    Kruskal's algorithm over the grid's lazily generated pairs, so only the
+    pairs up to the longest edge in the tree are ever generated.
+    """
+    circuits = DisjointSet(len(points))
+    edges = []
+    for d, a, b in SpatialGrid(points).pairs():
+        if circuits.union(a, b):
+            edges.append((d, a, b))
+            if circuits.connected():
+                break
+    return edges
+
+
+def coordinates(points: list[Node]):
+    import numpy as np
+    return np.array([(p.x, p.y, p.z) for p in points],
+                    dtype=np.int64).reshape(-1, 3)
+
+
+def closest_pairs(coords, count: int,
+                  block: int = 2048) -> list[tuple[int, int, int]]:
+    """The count closest (distance, i, j) pairs of an (n, 3) array
+
+    Squared distances are computed a block of rows against a block of
+    columns at a time, as |a|^2 + |b|^2 - 2ab with a matrix product. Only
+    entries no further than the running count-th closest are kept, so
+    memory is O(block**2 + count) rather than O(n**2).
+
+    Coordinates are shifted to start at zero. float64 only holds the sums
+    exactly while they then stay below 2**25, past which blocks of int64
+    differences are squared instead, up to 2**31.
+    """
+    import numpy as np
+    points = np.asarray(coords, dtype=np.int64).reshape(-1, 3)
+    if len(points):
+        points = points - points.min(axis=0)
+    span = int(points.max(initial=0))
+    if span >= 2**31:
+        raise ValueError(f"Coordinates span {span}, too far for int64")
+    if exact := span < 2**25:
+        floats = points.astype(np.float64)
+        norms = (floats ** 2).sum(axis=1)
+        dtype = np.float64
+    else:
+        block = min(block, 512)
+        dtype = np.int64
+
+    def squared(row, rows, col, cols):
+        if exact:
+            return (norms[row:row + rows, None] + norms[None, col:col + cols]
+                    - 2 * (floats[row:row + rows] @ floats[col:col + cols].T))
+        differences = (points[row:row + rows, None]
+                       - points[None, col:col + cols])
+        return (differences ** 2).sum(axis=2)
+
+    n = len(points)
+    distances = np.empty(0, dtype)
+    firsts = seconds = np.empty(0, np.intp)
+    cutoff = np.finfo(dtype).max if exact else np.iinfo(dtype).max
+    for row in range(0, n, block):
+        rows = min(block, n - row)
+        for col in range(row, n, block):
+            cols = min(block, n - col)
+            flat = squared(row, rows, col, cols).ravel()
+            near = np.flatnonzero(flat <= cutoff)
+            if row == col:
+                # Only pairs above the diagonal, each pair once
+                near = near[near // cols < near % cols]
+            distances = np.concatenate([distances, flat[near]])
+            firsts = np.concatenate([firsts, near // cols + row])
+            seconds = np.concatenate([seconds, near % cols + col])
+            if len(distances) > count:
+                # Keep anything tied with the count-th so ordering stays exact
+                cutoff = np.partition(distances, count - 1)[count - 1]
+                keep = distances <= cutoff
+                distances = distances[keep]
+                firsts, seconds = firsts[keep], seconds[keep]
+    order = np.lexsort((seconds, firsts, distances))[:count]
+    return list(zip(distances[order].astype(np.int64).tolist(),
+                    firsts[order].tolist(), seconds[order].tolist()))
+
+
 def part1(points, count=1000):
-    circuits = {point: frozenset([point]) for point in points}
-    pairs = list(combinations(points, 2))
-    for a, b in sorted(pairs, key=lambda p: p[0].distance(p[1]))[:count]:
-        if circuits[a] is circuits[b]:
-            continue
-        union = circuits[a] | circuits[b]
-        for node in union:
-            circuits[node] = union
-    sets = set(frozenset(v) for v in circuits.values())
-    sizes = sorted([len(s) for s in sets], reverse=True)
-    return sizes[0] * sizes[1] * sizes[2]
+    circuits = DisjointSet(len(points))
+    for _, a, b in closest_pairs(coordinates(points), count):
+        circuits.union(a, b)
+    return prod(circuits.largest(3))
 
 
 def part2(points):
-    points = frozenset(points)
-    circuits = {point: frozenset([point]) for point in points}
-    pairs = list(combinations(points, 2))
-    for a, b in sorted(pairs, key=lambda pair: pair[0].distance(pair[1])):
-        if circuits[a] is circuits[b]:
-            continue
-        union = circuits[a] | circuits[b]
-        if union == points:
-            return a.x * b.x
-        for node in union:
-            circuits[node] = union
-    raise NotImplementedError
+    points = list(dict.fromkeys(points))
+    if len(points) < 2:
+        raise NotImplementedError
+    _, a, b = spanning_tree(points)[-1]
+    return points[a].x * points[b].x
 
 
 def parse(line):
     return Node.from_line(line)
 
 
+def load(text):
+    return line_parser(text, parse=parse)
+
+
 TEST1 = """
 162,817,812
 57,618,57
@@ -85,7 +237,26 @@ def test_part2():
     assert part2(line_parser(TEST1, parse=parse)) == 25272
 
 
+def test_spatial_grid():
+    import random
+    points = [Node(*(random.randint(-500, 500) for _ in range(3)))
+              for _ in range(300)]
+    expected = sorted((a.distance(b), i, j)
+                      for (i, a), (j, b) in combinations(enumerate(points), 2))
+    assert list(SpatialGrid(points).pairs()) == expected
+    assert list(SpatialGrid(points, cell=7).pairs()) == expected
+    assert closest_pairs(coordinates(points), 500, block=64) == expected[:500]
+    assert len(closest_pairs(coordinates(points[:10]), 500)) == 45
+    # Too far apart for float64 sums, but close enough to need exact sums
+    far = [Node(*(random.randint(0, 2**30) + 2**40 for _ in range(3)))
+           for _ in range(200)]
+    far[1] = Node(far[0].x + 1, far[0].y, far[0].z)
+    expected = sorted((a.distance(b), i, j)
+                      for (i, a), (j, b) in combinations(enumerate(far), 2))
+    assert closest_pairs(coordinates(far), 300, block=64) == expected[:300]
+
+
 if __name__ == "__main__":
-    LINES = line_parser(get_input(day=8, year=2025), parse=parse)
+    LINES = load(get_input(day=8, year=2025))
     print(f"Part 1: {part1(LINES)}")
     print(f"Part 2: {part2(LINES)}")
@@ -1,9 +1,345 @@
 """Advent of Code Day 10 Solution."""
 
 from dataclasses import dataclass
+from fractions import Fraction
 from get_input import get_input, line_parser
-from scipy.optimize import linprog
-import numpy as np
+from itertools import islice
+from math import gcd, lcm
+import time
+
+
+def min_toggles(target: int, buttons: list[int],
+                method: str | None = None) -> tuple[int, int]:
+    """Fewest buttons whose masks XOR to target, and candidates tried
+
+    Gaussian elimination over GF(2), with each light an equation over the
+    buttons, gives one solution plus a basis of the null space. Every
+    solution is that one XOR some combination of the basis, so the null
+    space can be walked in Gray code order, 2**nullity candidates. With
+    few independent lights a breadth first search over the 2**rank light
+    states they can reach is cheaper, and otherwise the buttons are split
+    in half and the effects of each half's subsets matched up. method
+    picks one of TOGGLE_METHODS, by default the one trying fewest.
+    """
+    lights = max([target.bit_length(), *(b.bit_length() for b in buttons)])
+    # Row per light: bit j set if button j toggles it, then the target bit
+    rows = [(sum(1 << j for j, button in enumerate(buttons)
+                 if button >> i & 1),
+             target >> i & 1) for i in range(lights)]
+    pivots = []
+    for col in range(len(buttons)):
+        row = next((r for r in range(len(pivots), len(rows))
+                    if rows[r][0] >> col & 1), None)
+        if row is None:
+            continue
+        rank = len(pivots)
+        rows[rank], rows[row] = rows[row], rows[rank]
+        coefficients, value = rows[rank]
+        for r in range(len(rows)):
+            if r != rank and rows[r][0] >> col & 1:
+                rows[r] = (rows[r][0] ^ coefficients, rows[r][1] ^ value)
+        pivots.append(col)
+    if any(value for coefficients, value in rows[len(pivots):]):
+        raise ValueError("No combination of buttons reaches the target")
+
+    solution = sum(rows[r][1] << col for r, col in enumerate(pivots))
+    free = [col for col in range(len(buttons)) if col not in pivots]
+    basis = [(1 << f) | sum(1 << col for r, col in enumerate(pivots)
+                            if rows[r][0] >> f & 1)
+             for f in free]
+
+    half = len(buttons) // 2
+    costs = {
+        "null_space": 1 << len(basis),
+        "breadth_first": (1 << len(pivots)) * len(buttons),
+        "meet_in_middle": (1 << half) + (1 << (len(buttons) - half)),
+    }
+    method = method or min(costs, key=costs.get)
+    if method == "null_space":
+        best = solution.bit_count()
+        for i in range(1, 1 << len(basis)):
+            solution ^= basis[(i & -i).bit_length() - 1]
+            best = min(best, solution.bit_count())
+        return best, 1 << len(basis)
+    if method == "breadth_first":
+        return _breadth_first(target, buttons)
+
+    effects = {}
+    for presses, effect in _subsets(buttons[:half]):
+        effects[effect] = min(effects.get(effect, presses), presses)
+    best = min(presses + effects[target ^ effect]
+               for presses, effect in _subsets(buttons[half:])
+               if target ^ effect in effects)
+    return best, (1 << half) + (1 << (len(buttons) - half))
+
+
+TOGGLE_METHODS = ("null_space", "breadth_first", "meet_in_middle")
+
+
+def _breadth_first(target, buttons):
+    """Fewest presses reaching a reachable target, and states seen"""
+    seen = {0}
+    frontier = [0]
+    presses = 0
+    while target not in seen:
+        presses += 1
+        following = []
+        for state in frontier:
+            for button in buttons:
+                if (after := state ^ button) not in seen:
+                    seen.add(after)
+                    following.append(after)
+        frontier = following
+    return presses, len(seen)
+
+
+def _subsets(buttons):
+    """(size, XOR) of every subset of buttons, in Gray code order"""
+    effect = presses = 0
+    yield presses, effect
+    for i in range(1, 1 << len(buttons)):
+        bit = (i & -i).bit_length() - 1
+        effect ^= buttons[bit]
+        # Gray code i ^ (i >> 1) flips this bit, on or off
+        presses += 1 if (i ^ (i >> 1)) >> bit & 1 else -1
+        yield presses, effect
+
+
+def _reduce(row: list[int]) -> list[int]:
+    """Divide out the common factor so elimination doesn't blow up"""
+    divisor = 0
+    for value in row:
+        divisor = gcd(divisor, value)
+    return [value // divisor for value in row] if divisor > 1 else row
+
+
+def _relaxation(targets, buttons, eps=1e-9):
+    """Fewest presses if presses needn't be whole, with the duals
+
+    Two phase simplex over a dense tableau, returning (presses, duals)
+    for the optimum, or None if no real presses reach targets either.
+    """
+    m, n = len(targets), len(buttons)
+    # Row per counter: a column per button, an artificial one per counter
+    tableau = [[float(i in button) for button in buttons]
+               + [float(r == i) for r in range(m)] + [float(target)]
+               for i, target in enumerate(targets)]
+    basis = [n + i for i in range(m)]
+    for phase in (1, 2):
+        costs = [0.0] * n + [1.0] * m if phase == 1 else [1.0] * n + [0.0] * m
+        while True:
+            reduced = [costs[j] - sum(costs[basis[r]] * tableau[r][j]
+                                      for r in range(m))
+                       for j in range(n)]
+            enter = next((j for j in range(n) if reduced[j] < -eps), None)
+            if enter is None:
+                break
+            _, _, leave = min((tableau[r][-1] / tableau[r][enter], basis[r], r)
+                              for r in range(m) if tableau[r][enter] > eps)
+            pivot = tableau[leave]
+            pivot[:] = [value / pivot[enter] for value in pivot]
+            for r in range(m):
+                if r != leave and (factor := tableau[r][enter]):
+                    tableau[r] = [a - factor * b
+                                  for a, b in zip(tableau[r], pivot)]
+            basis[leave] = enter
+        # Still leaning on the artificial columns means there's no solution
+        if phase == 1 and sum(tableau[r][-1] for r in range(m)
+                              if basis[r] >= n) > 1e-7:
+            return None
+    presses = [0.0] * n
+    for r, b in enumerate(basis):
+        if b < n:
+            presses[b] = tableau[r][-1]
+    duals = [sum(costs[basis[r]] * tableau[r][n + i] for r in range(m))
+             for i in range(m)]
+    return presses, duals
+
+
+def _propagate(system, lo, hi, sweeps=20) -> bool:
+    """Tighten lo and hi in place to fit each low <= sum(c * x) <= high
+
+    system holds (terms, low, high) with terms (index, c) and low None for
+    no lower limit. False if some range empties. Chains of constraints can
+    creep a bound down one step a sweep, so stop after sweeps.
+    """
+    for _ in range(sweeps):
+        changed = False
+        for terms, low, high in system:
+            least = most = 0
+            for j, c in terms:
+                if c > 0:
+                    least += c * lo[j]
+                    most += c * hi[j]
+                else:
+                    least += c * hi[j]
+                    most += c * lo[j]
+            if least > high or (low is not None and most < low):
+                return False
+            for j, c in terms:
+                # Whatever the other terms leave room for
+                if c > 0:
+                    top = (high - least + c * lo[j]) // c
+                    bottom = None if low is None else \
+                        -((most - c * hi[j] - low) // c)
+                else:
+                    bottom = -((high - least + c * hi[j]) // -c)
+                    top = None if low is None else \
+                        (most - c * lo[j] - low) // -c
+                if top is not None and top < hi[j]:
+                    hi[j] = top
+                    changed = True
+                if bottom is not None and bottom > lo[j]:
+                    lo[j] = bottom
+                    changed = True
+                if lo[j] > hi[j]:
+                    return False
+        if not changed:
+            break
+    return True
+
+
+def min_presses(targets: tuple[int, ...],
+                buttons: list[tuple[int, ...]]) -> tuple[int, int]:
+    """Fewest presses making every counter reach its target, and nodes searched
+
+    Fraction free Gauss-Jordan elimination writes each pivot button in
+    terms of the free buttons. The free buttons are then searched depth
+    first, narrowest first, with every button's range propagated through
+    the rows. Once an answer is known, the total must beat it, and duals
+    from the relaxation with fractional presses bound the total tightly
+    enough to prune most of the search.
+    """
+    # Pressing either of two identical buttons is the same, so keep one
+    buttons = list(dict.fromkeys(tuple(sorted(set(button)))
+                                 for button in buttons))
+    # No button can be pressed more than its emptiest counter needs, and
+    # the widest make the best pivots, leaving narrow free buttons
+    caps = {button: min(targets[i] for i in button) for button in buttons}
+    buttons.sort(key=caps.get, reverse=True)
+    count = len(buttons)
+    # Row per counter: coefficient per button, then its target
+    rows = [[int(i in button) for button in buttons] + [target]
+            for i, target in enumerate(targets)]
+    pivots = []
+    for col in range(count):
+        row = next((r for r in range(len(pivots), len(rows))
+                    if rows[r][col]), None)
+        if row is None:
+            continue
+        rank = len(pivots)
+        rows[rank], rows[row] = rows[row], rows[rank]
+        if rows[rank][col] < 0:
+            rows[rank] = [-value for value in rows[rank]]
+        pivot = rows[rank]
+        for r in range(len(rows)):
+            if r != rank and (factor := rows[r][col]):
+                rows[r] = _reduce([pivot[col] * a - factor * b
+                                   for a, b in zip(rows[r], pivot)])
+        pivots.append(col)
+    if any(row[-1] for row in rows[len(pivots):]):
+        raise ValueError(f"No presses reach joltage {targets}")
+    rows = rows[:len(pivots)]
+
+    free = [col for col in range(count) if col not in pivots]
+    # Scaled by scale, total presses are constant + sum(weights[f] * x[f])
+    scale = lcm(*(row[col] for row, col in zip(rows, pivots)))
+    constant = sum(row[-1] * scale // row[col]
+                   for row, col in zip(rows, pivots))
+    weights = {f: scale - sum(row[f] * scale // row[col]
+                              for row, col in zip(rows, pivots))
+               for f in free}
+    system = [([(b, c) for b, c in enumerate(row[:-1]) if c],
+               row[-1], row[-1]) for row in rows]
+    objective = [(f, w) for f, w in weights.items() if w]
+
+    relaxed = _relaxation(targets, buttons)
+    if relaxed is not None:
+        # Any duals d give denominator * sum(x) = offset + sum(reduced * x)
+        # exactly, rounding them only loosens the bound
+        guess, duals = relaxed
+        duals = [Fraction(d).limit_denominator(1 << 10) for d in duals]
+        denominator = lcm(*(d.denominator for d in duals))
+        duals = [int(d * denominator) for d in duals]
+        offset = sum(t * d for t, d in zip(targets, duals))
+        reduced = [(b, denominator - sum(duals[i] for i in button))
+                   for b, button in enumerate(buttons)]
+        reduced = [(b, c) for b, c in reduced if c]
+
+    best = None
+    nodes = 0
+
+    def bounded():
+        if best is None:
+            return system
+        extra = [(objective, None, best * scale - constant - 1)]
+        if relaxed is not None:
+            extra.append((reduced, None, (best - 1) * denominator - offset))
+        return system + extra
+
+    def settle(x):
+        """Fill in the pivot presses, None unless whole and non-negative"""
+        for row, col in zip(rows, pivots):
+            residual = row[-1] - sum(row[f] * x[f] for f in free)
+            if residual < 0 or residual % row[col]:
+                return None
+            x[col] = residual // row[col]
+        return x
+
+    def search(lo, hi):
+        nonlocal best, nodes
+        nodes += 1
+        if not _propagate(bounded(), lo, hi):
+            return
+        open_ = [f for f in free if lo[f] < hi[f]]
+        if len(open_) > 1:
+            # Branch on the narrowest, nearest the fractional optimum first
+            f = min(open_, key=lambda f: hi[f] - lo[f])
+            values = range(lo[f], hi[f] + 1)
+            if relaxed is not None:
+                values = sorted(values, key=lambda v: abs(v - guess[f]))
+            elif weights[f] < 0:
+                values = reversed(values)
+            seen = best
+            for value in values:
+                if best != seen:
+                    # A better answer tightens every range left
+                    seen = best
+                    if not _propagate(bounded(), lo, hi):
+                        return
+                if lo[f] <= value <= hi[f]:
+                    search([*lo[:f], value, *lo[f + 1:]],
+                           [*hi[:f], value, *hi[f + 1:]])
+            return
+        x = list(lo)
+        if not open_:
+            if settle(x) is not None and (best is None or sum(x) < best):
+                best = sum(x)
+            return
+        f, = open_
+        # Exactly the presses leaving every pivot button non-negative
+        for row in rows:
+            residual = row[-1] - sum(row[g] * x[g] for g in free if g != f)
+            if row[f] > 0:
+                hi[f] = min(hi[f], residual // row[f])
+            elif row[f] < 0:
+                lo[f] = max(lo[f], -(residual // -row[f]))
+        values = range(lo[f], hi[f] + 1)
+        if weights[f] < 0:
+            values = reversed(values)
+        # Whole pivot presses repeat every scale presses, so the first
+        # that fits is the cheapest and there's none after scale misses
+        for value in islice(values, scale):
+            x[f] = value
+            if settle(x) is not None:
+                if best is None or sum(x) < best:
+                    best = sum(x)
+                return
+
+    search([0] * count, [caps[button] for button in buttons])
+    if best is None:
+        raise ValueError(f"No presses reach joltage {targets}")
+    return best, nodes
 
 
 @dataclass
@@ -12,27 +348,25 @@ class Machine:
     buttons: list[tuple[int, ...]]
     joltage: tuple[int]
 
-    def solve(self) -> int:
-        previous = {tuple([False] * len(self.lights))}
+    @property
+    def light_mask(self) -> int:
+        return sum(1 << i for i, on in enumerate(self.lights) if on)
 
-        count = 0
-        seen = set()
-        while True:
-            current = set()
-            for state in previous:
-                if state in seen:
-                    continue
-                if state == self.lights:
-                    return count
-                for button in self.buttons:
-                    new_state = list(state)
-                    for idx in button:
-                        new_state[idx] = not new_state[idx]
-                    current.add(tuple(new_state))
-            previous = current
-            count += 1
+    @property
+    def button_masks(self) -> list[int]:
+        return [sum(1 << i for i in button) for button in self.buttons]
+
+    def solve(self) -> int:
+        return min_toggles(self.light_mask, self.button_masks)[0]
 
     def solve_joltage(self) -> int:
+        return min_presses(self.joltage, self.buttons)[0]
+
+    def solve_joltage_linprog(self) -> int:
+        # Deferred as importing scipy dwarfs solving part 1
+        from scipy.optimize import linprog
+        import numpy as np
+
         buttons = np.array([
             [int(i in button) for i in range(len(self.joltage))]
             for button in self.buttons
@@ -42,14 +376,98 @@ class Machine:
         return round(result.fun)
 
 
-def part1(machines):
+SOLVERS = {
+    "lights": lambda machine: min_toggles(machine.light_mask,
+                                          machine.button_masks),
+    "joltage": lambda machine: min_presses(machine.joltage, machine.buttons),
+}
+
+
+@dataclass
+class Telemetry:
+    index: int
+    answer: int | None
+    seconds: float
+    nodes: int
+    error: str | None = None
+
+
+def _solve_chunk(method, chunk, timeout):
+    from harness import time_limit
+    telemetry = []
+    for index, machine in chunk:
+        start = time.perf_counter()
+        try:
+            with time_limit(timeout):
+                answer, nodes = SOLVERS[method](machine)
+            error = None
+        except (TimeoutError, ValueError) as exception:
+            answer, nodes, error = None, 0, str(exception)
+        seconds = time.perf_counter() - start
+        telemetry.append(Telemetry(index, answer, seconds, nodes, error))
+    return telemetry
+
+
+def solve_batch(machines, method, workers=None, chunksize=8,
+                timeout=None) -> list[Telemetry]:
+    """Solve machines across a process pool, recording each one's solve
+
+    Machines are handed out chunksize at a time and each gets timeout
+    seconds. Results come back in the order of machines, whatever order
+    the workers finish in.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    machines = list(enumerate(machines))
+    chunks = [machines[i:i + chunksize]
+              for i in range(0, len(machines), chunksize)]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_solve_chunk, method, chunk, timeout)
+                   for chunk in chunks]
+        telemetry = [result for future in futures
+                     for result in future.result()]
+    return sorted(telemetry, key=lambda result: result.index)
+
+
+def report(telemetry: list[Telemetry], count=5) -> str:
+    """The slowest machines, and any that failed"""
+    lines = [f"{'machine':>7} {'seconds':>9} {'nodes':>9}"]
+    slowest = sorted(telemetry, key=lambda result: result.seconds,
+                     reverse=True)
+    for result in slowest[:count]:
+        lines.append(
+            f"{result.index:7d} {result.seconds:9.4f} {result.nodes:9d}")
+    lines.extend(f"Machine {result.index} failed: {result.error}"
+                 for result in telemetry if result.error)
+    return "\n".join(lines)
+
+
+def total(telemetry: list[Telemetry]) -> int:
+    if failed := [result for result in telemetry if result.error]:
+        raise RuntimeError(
+            f"{len(failed)} machine(s) unsolved\n{report(telemetry)}")
+    return sum(result.answer for result in telemetry)
+
+
+def part1(machines, workers=0):
+    if workers:
+        return total(solve_batch(machines, "lights", workers))
     return sum(machine.solve() for machine in machines)
 
 
-def part2(machines):
+def part2(machines, workers=0):
+    if workers:
+        return total(solve_batch(machines, "joltage", workers))
     return sum(machine.solve_joltage() for machine in machines)
 
 
+def part2_linprog(machines):
+    return sum(machine.solve_joltage_linprog() for machine in machines)
+
+
+# Alternative implementations for aoc bench to time alongside the parts
+VARIANTS = {"part2_linprog": part2_linprog}
+
+
 def parse(line):
     lights, *buttons, joltage = list(line.split(' '))
     return Machine(
@@ -59,6 +477,10 @@ def parse(line):
     )
 
 
+def load(text):
+    return line_parser(text, parse=parse)
+
+
 TEST1 = """
 [.##.] (3) (1,3) (2) (2,3) (0,2) (0,1) {3,5,4,7}
 [...#.] (0,2,3,4) (2,3) (0,4) (0,1,2) (1,2,3,4) {7,5,12,7,2}
@@ -74,7 +496,110 @@ def test_part2():
     assert part2(line_parser(TEST1, parse=parse)) == 33
 
 
+def test_min_toggles():
+    import random
+    from functools import reduce
+    from itertools import combinations
+    from operator import xor
+    for _ in range(50):
+        buttons = [random.randint(1, 255)
+                   for _ in range(random.randint(1, 10))]
+        target = random.choice([0] + buttons) ^ random.choice(buttons)
+        fewest = min(size for size in range(len(buttons) + 1)
+                     for chosen in combinations(buttons, size)
+                     if reduce(xor, chosen, 0) == target)
+        assert min_toggles(target, buttons)[0] == fewest
+        for method in TOGGLE_METHODS:
+            assert min_toggles(target, buttons, method)[0] == fewest
+
+    # Big machines, where any fixed choice of method takes seconds
+    for lights, nullity in ((23, 17), (12, 28), (22, 18)):
+        basis = [1 << i for i in range(lights)]
+        buttons = basis + [random.randint(1, (1 << lights) - 1)
+                           for _ in range(nullity)]
+        random.shuffle(buttons)
+        target = random.randint(0, (1 << lights) - 1)
+        start = time.perf_counter()
+        presses, tried = min_toggles(target, buttons)
+        assert time.perf_counter() - start < 1, (lights, nullity)
+        assert presses <= target.bit_count() and tried <= 1 << 21
+
+
+def test_min_presses():
+    import random
+    for _ in range(30):
+        lights = random.randint(2, 8)
+        buttons = [tuple(sorted(random.sample(range(lights),
+                                              random.randint(1, lights))))
+                   for _ in range(random.randint(1, lights + 2))]
+        presses = [random.randint(0, 30) for _ in buttons]
+        joltage = tuple(sum(p for p, b in zip(presses, buttons) if i in b)
+                        for i in range(lights))
+        machine = Machine(lights=(False,) * lights, buttons=buttons,
+                          joltage=joltage)
+        assert machine.solve_joltage() == machine.solve_joltage_linprog()
+    import pytest
+    with pytest.raises(ValueError):
+        min_presses((1, 2), [(0, 1)])
+    # No free buttons, but the only solution presses (0,) -1 times
+    for targets in ((1, 2), (2, 6)):
+        with pytest.raises(ValueError):
+            min_presses(targets, [(0, 1), (0,)])
+
+
+def test_min_presses_speed():
+    import random
+    rng = random.Random(10)
+    machines = []
+    for _ in range(40):
+        lights = rng.randint(6, 10)
+        buttons = [tuple(sorted(rng.sample(range(lights), rng.randint(2, 6))))
+                   for _ in range(rng.randint(lights + 1, lights + 5))]
+        presses = [rng.randint(0, 200) for _ in buttons]
+        joltage = tuple(sum(p for p, b in zip(presses, buttons) if i in b)
+                        for i in range(lights))
+        machines.append(Machine(lights=(False,) * lights, buttons=buttons,
+                                joltage=joltage))
+    # Leave importing scipy out of the timing
+    machines[0].solve_joltage_linprog()
+    start = time.perf_counter()
+    exact = [machine.solve_joltage() for machine in machines]
+    middle = time.perf_counter()
+    assert exact == [machine.solve_joltage_linprog() for machine in machines]
+    assert middle - start < time.perf_counter() - middle
+
+    # Fractional presses come within 3 of the answer all over, so this one
+    # searches tens of thousands of nodes
+    joltage = (489, 296, 407, 353, 685, 261, 513, 779, 472, 459)
+    buttons = [(4,), (5, 6), (3, 9), (7, 9), (7,), (0, 5, 7, 8), (3, 4, 6, 7),
+               (8,), (1, 2, 4, 7), (2, 3, 6), (0, 1), (2, 6, 8), (0, 2, 5, 9),
+               (0,), (0, 4)]
+    start = time.perf_counter()
+    assert min_presses(joltage, buttons)[0] == 1848
+    assert time.perf_counter() - start < 5
+
+
+def test_solve_batch():
+    machines = line_parser(TEST1, parse=parse)
+    telemetry = solve_batch(machines, "joltage", workers=2, chunksize=2)
+    assert [result.index for result in telemetry] == [0, 1, 2]
+    assert total(telemetry) == 33
+    assert all(result.nodes > 0 for result in telemetry)
+    assert part1(machines, workers=2) == 7
+    unsolvable = Machine(lights=(True,), buttons=[(0,)], joltage=(1, 2))
+    failed = solve_batch([unsolvable], "joltage", workers=1)
+    assert failed[0].error and "failed" in report(failed)
+
+
 if __name__ == "__main__":
-    LINES = line_parser(get_input(day=10, year=2025), parse=parse)
-    print(f"Part 1: {part1(LINES)}")
-    print(f"Part 2: {part2(LINES)}")
+    import sys
+    LINES = load(get_input(day=10, year=2025))
+    if len(sys.argv) > 1:
+        # python day10.py WORKERS solves in batches and reports the slowest
+        for part, method in ((1, "lights"), (2, "joltage")):
+            telemetry = solve_batch(LINES, method, workers=int(sys.argv[1]))
+            print(report(telemetry))
+            print(f"Part {part}: {total(telemetry)}")
+    else:
+        print(f"Part 1: {part1(LINES)}")
+        print(f"Part 2: {part2(LINES)}")
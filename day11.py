@@ -1,27 +1,87 @@
-"""Advent of Code Day 10 Solution."""
+"""Advent of Code Day 11 Solution."""
 
-from dataclasses import dataclass
+from array import array
 from get_input import get_input, line_parser
-from functools import cache
 
 
-@dataclass
 class Graph:
-    graph: dict[str, tuple[str]]
-
-    @cache
-    def paths(self, src, dst: str) -> int:
-        if src == dst:
-            return 1
-        return sum(self.paths(next_node, dst=dst)
-                   for next_node in self.graph.get(src, []))
-
-    def __hash__(self):
+    """Directed acyclic graph compiled for counting paths
+
+    Node names are interned to integers, edges are stored as compressed
+    sparse rows and nodes are put in topological order once. Path counts
+    from a source to every node, or from every node to a sink, are then
+    single iterative passes, cached on the instance.
+    """
+
+    def __init__(self, graph: dict[str, tuple[str]]):
+        self.graph = graph
+        self.names = list(dict.fromkeys(
+            [*graph, *(node for nodes in graph.values() for node in nodes)]))
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        for name in self.names:
+            self.targets.extend(self.ids[node] for node in graph.get(name, ()))
+            self.offsets.append(len(self.targets))
+        self.order = self._topological_order()
+        self._from = {}
+        self._to = {}
+
+    def successors(self, node: int):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def _topological_order(self) -> list[int]:
+        incoming = [0] * len(self.names)
+        for target in self.targets:
+            incoming[target] += 1
+        queue = [node for node, count in enumerate(incoming) if count == 0]
+        for node in queue:
+            for target in self.successors(node):
+                incoming[target] -= 1
+                if incoming[target] == 0:
+                    queue.append(target)
+        if len(queue) != len(self.names):
+            raise ValueError("Graph has a cycle")
+        return queue
+
+    def paths_from(self, src: str) -> list[int]:
+        """Number of paths from src to each node, by node id
+
+        All zero if src isn't in the graph.
         """
-        Custom hash to allow caching methods.
-        DO NOT MODIFY THE graph AFTER CREATING IT.
+        if src not in self._from:
+            counts = [0] * len(self.names)
+            if src in self.ids:
+                counts[self.ids[src]] = 1
+            for node in self.order:
+                if count := counts[node]:
+                    for target in self.successors(node):
+                        counts[target] += count
+            self._from[src] = counts
+        return self._from[src]
+
+    def paths_to(self, dst: str) -> list[int]:
+        """Number of paths from each node to dst, by node id
+
+        All zero if dst isn't in the graph.
         """
-        return hash(id(self))
+        if dst not in self._to:
+            counts = [0] * len(self.names)
+            if dst in self.ids:
+                counts[self.ids[dst]] = 1
+            for node in reversed(self.order):
+                counts[node] += sum(counts[target]
+                                    for target in self.successors(node))
+            self._to[dst] = counts
+        return self._to[dst]
+
+    def paths(self, src: str, dst: str) -> int:
+        """Number of paths from src to dst, one (the empty path) if equal"""
+        if src == dst:
+            return 1
+        if src not in self.ids or dst not in self.ids:
+            return 0
+        return self.paths_to(dst)[self.ids[src]]
 
 
 def part1(machines):
@@ -39,7 +99,10 @@ def part2(machines):
         second, third = 'dac', 'fft'
     else:
         raise ValueError("No path between fft and dac found")
-    return graph.paths('svr', second) * ways * graph.paths(third, 'out')
+    # One pass out of svr and one into out give the outer legs
+    first = graph.paths_from('svr')[graph.ids[second]]
+    last = graph.paths_to('out')[graph.ids[third]]
+    return first * ways * last
 
 
 def parse(line: str) -> dict[str, tuple[str]]:
@@ -47,6 +110,10 @@ def parse(line: str) -> dict[str, tuple[str]]:
     return name.strip(), tuple(outs.strip().split())
 
 
+def load(text):
+    return line_parser(text, parse=parse)
+
+
 TEST1 = """
 aaa: you hhh
 you: bbb ccc
@@ -86,7 +153,17 @@ def test_part2():
     assert part2(line_parser(TEST2, parse=parse)) == 2
 
 
+def test_deep_graph():
+    chain = {f"n{i}": (f"n{i + 1}", f"m{i}") for i in range(50_000)}
+    chain.update({f"m{i}": (f"n{i + 1}",) for i in range(50_000)})
+    graph = Graph(chain)
+    assert graph.paths("n0", "n50000") == 2 ** 50_000
+    assert graph.paths("n0", "missing") == 0
+    assert graph.paths("missing", "missing") == 1
+    assert graph.paths_from("n0")[graph.ids["n50000"]] == 2 ** 50_000
+
+
 if __name__ == "__main__":
-    LINES = line_parser(get_input(day=11, year=2025), parse=parse)
+    LINES = load(get_input(day=11, year=2025))
     print(f"Part 1: {part1(LINES)}")
     print(f"Part 2: {part2(LINES)}")
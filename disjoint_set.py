@@ -0,0 +1,74 @@
+"""Array backed disjoint set (union-find) over the integers 0 to n-1"""
+
+from array import array
+from collections import Counter
+
+
+class DisjointSet:
+    """Union by size with path compression
+
+    The number of components is kept up to date, as is a histogram of
+    component sizes. There can only be O(sqrt(n)) distinct sizes, so the
+    largest components are found without visiting every element.
+    """
+
+    def __init__(self, size: int):
+        self.parent = array('q', range(size))
+        self.sizes = array('q', [1] * size)
+        self.components = size
+        self.histogram = Counter({1: size} if size else {})
+
+    def find(self, item: int) -> int:
+        root = item
+        while (parent := self.parent[root]) != root:
+            root = parent
+        while (parent := self.parent[item]) != root:
+            self.parent[item] = root
+            item = parent
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the components of a and b, False if already the same"""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.sizes[a] < self.sizes[b]:
+            a, b = b, a
+        for root in (a, b):
+            self.histogram[self.sizes[root]] -= 1
+            if self.histogram[self.sizes[root]] == 0:
+                del self.histogram[self.sizes[root]]
+        self.parent[b] = a
+        self.sizes[a] += self.sizes[b]
+        self.histogram[self.sizes[a]] += 1
+        self.components -= 1
+        return True
+
+    def size(self, item: int) -> int:
+        return self.sizes[self.find(item)]
+
+    def connected(self) -> bool:
+        return self.components == 1
+
+    def largest(self, count: int) -> list[int]:
+        """Sizes of the count largest components, largest first"""
+        sizes = []
+        for size in sorted(self.histogram, reverse=True):
+            needed = count - len(sizes)
+            sizes.extend([size] * min(self.histogram[size], needed))
+            if len(sizes) == count:
+                break
+        return sizes
+
+
+def test_disjoint_set():
+    sets = DisjointSet(10)
+    assert sets.union(0, 1) and sets.union(2, 3) and sets.union(1, 3)
+    assert not sets.union(0, 2)
+    assert sets.union(4, 5)
+    assert sets.find(3) == sets.find(0) and sets.size(2) == 4
+    assert sets.components == 6
+    assert sets.largest(3) == [4, 2, 1]
+    for i in range(9):
+        sets.union(i, i + 1)
+    assert sets.connected() and sets.largest(2) == [10]
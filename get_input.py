@@ -1,34 +1,305 @@
 """Module for getting the input for advent of code"""
 
+import hashlib
 import logging
-import requests
+import mmap
 import os
+import sqlite3
+import time
+import zlib
 
 AOC_URL = "http://adventofcode.com"
+STORE = ".AoC-inputs.sqlite"
+CACHE_DIR = ".AoC-cache"
 LOG = logging.getLogger(__name__)
 
 
-def get_input(day, year):
+class InputStore:
+    """Single sqlite file of zlib compressed inputs keyed by (year, day)"""
+
+    def __init__(self, path=STORE):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS inputs ("
+            " year INTEGER, day INTEGER, sha256 TEXT, data BLOB,"
+            " PRIMARY KEY (year, day))"
+        )
+
+    def get(self, day, year):
+        row = self.db.execute(
+            "SELECT data FROM inputs WHERE year = ? AND day = ?", (year, day)
+        ).fetchone()
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode()
+
+    def digest(self, day, year):
+        row = self.db.execute(
+            "SELECT sha256 FROM inputs WHERE year = ? AND day = ?", (year, day)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, day, year, text):
+        data = text.encode()
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO inputs VALUES (?, ?, ?, ?)",
+                (year, day, hashlib.sha256(data).hexdigest(),
+                 zlib.compress(data, 9)),
+            )
+
+    def __contains__(self, key):
+        day, year = key
+        return self.digest(day, year) is not None
+
+    def close(self):
+        self.db.close()
+
+
+class Fetcher:
+    """Downloads inputs over one pooled session, retrying with backoff"""
+
+    def __init__(self, url=AOC_URL, session=None, retries=4, backoff=0.5,
+                 workers=8, timeout=30):
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.workers = workers
+        # Deferred so reading stored inputs doesn't pay to import requests
+        import requests
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if session is None:
+            session = os.environ['SESSION']
+        self.session.cookies.set("session", session)
+
+    def fetch(self, day, year):
+        import requests
+        url = f"{self.url}/{year}/day/{day}/input"
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                reason = str(error)
+            else:
+                if response.ok:
+                    return response.text
+                # Client errors (bad session, day not unlocked) won't recover
+                reason = f"{response.status_code}: {response.reason}"
+                if response.status_code < 500 and response.status_code != 429:
+                    break
+            if attempt < self.retries:
+                LOG.warning("Retrying %s: %s", url, reason)
+                time.sleep(self.backoff * 2 ** attempt)
+        raise RuntimeError(f"Could not get {url}: {reason}")
+
+    def prefetch(self, keys, store):
+        """Download every (day, year) in keys that isn't already stored
+
+        Each input is stored as soon as it arrives, so one failed day
+        doesn't lose the rest. The first failure is raised at the end.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        missing = [(day, year) for day, year in keys
+                   if (day, year) not in store]
+        failure = None
+        with ThreadPoolExecutor(self.workers) as pool:
+            futures = {pool.submit(self.fetch, *key): key for key in missing}
+            for future in as_completed(futures):
+                try:
+                    text = future.result()
+                except Exception as error:
+                    failure = failure or error
+                    continue
+                store.put(*futures[future], text)
+        if failure is not None:
+            raise failure
+        return missing
+
+    def close(self):
+        self.session.close()
+
+
+def get_input(day, year, store=None):
     """Get the input for a specific day and year from advent of code"""
+    if store is None:
+        store = InputStore()
+        try:
+            return get_input(day, year, store)
+        finally:
+            store.close()
+    if (text := store.get(day, year)) is not None:
+        return text
+
+    # Migrate inputs cached one file per day by older versions
     file_name = f".AoC-{year:04}-{day:02}.tmp"
     try:
         with open(file_name, 'r') as file_handle:
-            return file_handle.read()
+            text = file_handle.read()
     except FileNotFoundError:
         LOG.warning("Attempting to download file from AOC")
+        fetcher = Fetcher()
+        try:
+            text = fetcher.fetch(day, year)
+        finally:
+            fetcher.close()
+    store.put(day, year, text)
+    return text
 
-    url = f"{AOC_URL}/{year}/day/{day}/input"
-    session = os.environ['SESSION']
-    response = requests.get(url, cookies=dict(session=session))
-    if not response.ok:
-        raise RuntimeError(
-            f"Could not get {url}: {response.status_code}: {response.reason}"
-        )
-    with open(file_name, 'w') as file_handle:
-        file_handle.write(response.text)
-    return response.text
+
+def prefetch(days, years, store=None, **kwargs):
+    """Concurrently download all the missing days for the years given"""
+    if store is None:
+        store = InputStore()
+        try:
+            return prefetch(days, years, store, **kwargs)
+        finally:
+            store.close()
+    keys = [(day, year) for year in years for day in days]
+    if all(key in store for key in keys):
+        return []
+    fetcher = Fetcher(**kwargs)
+    try:
+        return fetcher.prefetch(keys, store)
+    finally:
+        fetcher.close()
+
+
+def input_file(day, year, store=None):
+    """Path to an uncompressed copy of the input that can be memory mapped"""
+    file_name = os.path.join(CACHE_DIR, f"{year:04}-{day:02}.txt")
+    if not os.path.exists(file_name):
+        text = get_input(day, year, store=store)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(file_name, 'w') as file_handle:
+            file_handle.write(text)
+    return file_name
 
 
 def line_parser(text, parse=int, seperator='\n'):
     """Parse lines, usually into base 10 integers by lines"""
     return [parse(item) for item in text.strip().split(seperator) if item != '']
+
+
+def _spans(buffer, seperator, size=1):
+    """Yield (start, end) offsets covering size items at a time"""
+    start = 0
+    while start < len(buffer):
+        end = start
+        for _ in range(size):
+            end = buffer.find(seperator, end)
+            if end == -1:
+                end = len(buffer)
+                break
+            end += len(seperator)
+        yield start, end
+        start = end
+
+
+def line_stream(file_name, parse=int, seperator='\n', raw=False):
+    """Lazily parse the items of a file without reading it into memory
+
+    Items are sliced out of a memory map one at a time, so only the current
+    item is ever copied. With raw the item is passed to parse as bytes.
+    """
+    seperator = seperator.encode()
+    with open(file_name, 'rb') as file_handle:
+        if os.fstat(file_handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file_handle.fileno(), 0,
+                       access=mmap.ACCESS_READ) as buffer:
+            view = memoryview(buffer)
+            try:
+                for start, end in _spans(buffer, seperator):
+                    item = bytes(view[start:end]).strip()
+                    if item == b'':
+                        continue
+                    yield parse(item if raw else item.decode())
+            finally:
+                view.release()
+
+
+def chunk_stream(file_name, parse, size=1 << 16, seperator='\n'):
+    """Lazily parse a file in batches, handing parse bytes of size items"""
+    seperator = seperator.encode()
+    with open(file_name, 'rb') as file_handle:
+        if os.fstat(file_handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file_handle.fileno(), 0,
+                       access=mmap.ACCESS_READ) as buffer:
+            view = memoryview(buffer)
+            try:
+                for start, end in _spans(buffer, seperator, size):
+                    yield parse(view[start:end].tobytes())
+            finally:
+                view.release()
+
+
+def test_line_stream(tmp_path):
+    text = "\n+1\n-2\n\n+3\n-4\n+5\n"
+    (file_name := tmp_path / "input.txt").write_text(text)
+    assert list(line_stream(file_name)) == line_parser(text)
+    assert list(line_stream(file_name, parse=len, raw=True)) == [2] * 5
+    chunks = list(chunk_stream(
+        file_name, parse=lambda chunk: line_parser(chunk.decode()), size=2))
+    assert chunks == [[1], [-2], [3, -4], [5]]
+
+
+def test_prefetch(tmp_path):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import threading
+
+    import pytest
+
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            if "/day/4/" in self.path:
+                self.send_response(404)
+                self.end_headers()
+                return
+            # Time out or fail the first request for each day to retry it
+            if "/day/5/" in self.path and hits.count(self.path) == 1:
+                time.sleep(0.5)
+                return
+            if hits.count(self.path) == 1:
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = self.path.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        store = InputStore(tmp_path / "inputs.sqlite")
+        url = f"http://127.0.0.1:{server.server_port}"
+        fetched = prefetch(range(1, 4), [2025], store=store, url=url,
+                           session="test", backoff=0)
+        assert fetched == [(1, 2025), (2, 2025), (3, 2025)]
+        assert get_input(2, 2025, store=store) == "/2025/day/2/input"
+        assert prefetch(range(1, 4), [2025], store=store, url=url,
+                        session="test") == []
+        assert len(hits) == 6
+
+        # Day 4 doesn't exist, but day 5 is still kept after a timeout
+        with pytest.raises(RuntimeError, match="404"):
+            prefetch(range(1, 6), [2025], store=store, url=url,
+                     session="test", backoff=0, timeout=0.2)
+        assert (4, 2025) not in store
+        assert get_input(5, 2025, store=store) == "/2025/day/5/input"
+    finally:
+        server.shutdown()
@@ -0,0 +1,171 @@
+"""Shared machinery for loading, running and timing the daily solutions"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import importlib
+import os
+import re
+import signal
+import time
+
+from cache import MISSING, Cache, digest, source_digest
+from get_input import get_input
+
+YEAR = 2025
+
+
+def discover(path=None):
+    """Map day numbers to the names of the dayNN modules in path
+
+    By default, the directory the solutions live in.
+    """
+    if path is None:
+        path = os.path.dirname(os.path.abspath(__file__))
+    days = {}
+    for name in sorted(os.listdir(path)):
+        if m := re.fullmatch(r"day(\d\d)\.py", name):
+            days[int(m.group(1))] = name[:-3]
+    return days
+
+
+def module(day):
+    return importlib.import_module(f"day{day:02}")
+
+
+def load(day_module, text):
+    """Turn raw input into what part1 and part2 take, as __main__ does"""
+    if hasattr(day_module, "load"):
+        return day_module.load(text)
+    return day_module.parse(text)
+
+
+@contextmanager
+def time_limit(seconds):
+    """Raise TimeoutError in the block once seconds of wall time pass"""
+    if not seconds:
+        yield
+        return
+
+    def alarm(signum, frame):
+        raise TimeoutError(f"timed out after {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@dataclass
+class Result:
+    day: int
+    answers: dict[str, object] = field(default_factory=dict)
+    times: dict[str, float] = field(default_factory=dict)
+    cached: set[str] = field(default_factory=set)
+
+
+def timed(result, name, timeout, func, *args):
+    """Call func, recording its answer (or failure) and time under name"""
+    start = time.perf_counter()
+    try:
+        with time_limit(timeout):
+            value = func(*args)
+    except NotImplementedError:
+        value = None
+        result.answers[name] = "-"
+    except TimeoutError:
+        value = None
+        result.answers[name] = "timeout"
+    except Exception as error:
+        value = None
+        result.answers[name] = f"{type(error).__name__}: {error}"
+    else:
+        result.answers[name] = value
+    result.times[name] = time.perf_counter() - start
+    return value
+
+
+def cached(result, name, cache, key):
+    """Fill in name from the cache, returning the value or MISSING"""
+    start = time.perf_counter()
+    if (value := cache.get(key)) is not MISSING:
+        result.cached.add(name)
+        result.times[name] = time.perf_counter() - start
+    return value
+
+
+def run_day(day, parts=(1, 2), timeout=None, year=YEAR, cache=None):
+    """Parse and solve the given parts of one day
+
+    If cache is a Cache, or the path of one, parsed input and answers are
+    reused for as long as neither the input nor the day's source changes.
+    """
+    if cache is not None and not isinstance(cache, Cache):
+        cache = Cache(cache)
+        try:
+            return run_day(day, parts, timeout, year, cache)
+        finally:
+            cache.close()
+    day_module = module(day)
+    result = Result(day)
+    text = get_input(day, year)
+    if cache is not None:
+        keys = (digest(text), source_digest(day_module))
+
+    data = MISSING
+    for part in parts:
+        name = f"part{part}"
+        if cache is not None:
+            answer_key = Cache.key("answer", *keys, name)
+            answer = cached(result, name, cache, answer_key)
+            if answer is not MISSING:
+                result.answers[name] = answer
+                continue
+
+        if data is MISSING and cache is not None:
+            parse_key = Cache.key("parse", *keys)
+            data = cached(result, "parse", cache, parse_key)
+        if data is MISSING:
+            data = timed(result, "parse", timeout, load, day_module, text)
+            failure = result.answers.pop("parse")
+            if data is None:
+                # Show why there are no answers in the parts still to run
+                for part in parts:
+                    result.answers.setdefault(
+                        f"part{part}", f"parse {failure}")
+                return result
+            if cache is not None:
+                cache.put(parse_key, "parse", data)
+
+        answer = timed(result, name, timeout, getattr(day_module, name), data)
+        if cache is not None and answer is not None:
+            cache.put(answer_key, "answer", answer)
+    return result
+
+
+def test_discover():
+    days = discover()
+    assert days[1] == "day01"
+    assert 9 not in days
+
+
+def test_run_day_cache(tmp_path, monkeypatch):
+    text = module(1).TEST1
+    monkeypatch.setattr("harness.get_input", lambda day, year: text)
+    path = tmp_path / "cache.sqlite"
+    first = run_day(1, cache=path)
+    assert first.answers == {"part1": 3, "part2": 6}
+    assert first.cached == set()
+    second = run_day(1, cache=path)
+    assert second.answers == first.answers
+    assert second.cached == {"part1", "part2"}
+    assert "parse" not in second.times
+
+
+def test_run_day_parse_failure(monkeypatch):
+    monkeypatch.setattr("harness.get_input", lambda day, year: "garbage")
+    result = run_day(1)
+    assert result.answers["part1"].startswith("parse ValueError")
+    assert result.answers["part2"] == result.answers["part1"]
@@ -0,0 +1,182 @@
+"""Profiling of each day's parse, part1 and part2"""
+
+from collections import Counter
+import cProfile
+import os
+import pstats
+import signal
+import subprocess
+import sys
+
+from harness import discover, load, module
+
+# Seconds each day module should take to import, and modules it mustn't
+# import until they're used. Wall time is too noisy to fail on, so only
+# the heavy imports are enforced and the budget is reported.
+IMPORT_BUDGET = 0.05
+HEAVY_IMPORTS = ("numpy", "scipy", "requests")
+
+
+def label(code):
+    file_name = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({file_name}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """Statistical profiler recording the main thread's stack on a timer
+
+    Samples are driven by SIGPROF so only CPU time is counted, and stacks
+    are trimmed at the call into the profiled function.
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = Counter()
+        self.root = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None and frame.f_code is not self.root:
+            stack.append(label(frame.f_code))
+            frame = frame.f_back
+        self.stacks[";".join(reversed(stack))] += 1
+
+    def runcall(self, func, *args):
+        self.root = Sampler.runcall.__code__
+        previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return func(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+    def dump_collapsed(self, path):
+        """Write stacks in the collapsed format flamegraph.pl reads"""
+        with open(path, "w") as file_handle:
+            for stack, count in sorted(self.stacks.items()):
+                if stack:
+                    file_handle.write(f"{stack} {count}\n")
+
+    def hottest(self, count=10):
+        """(function, self seconds, total seconds) sorted by self time"""
+        own, total = Counter(), Counter()
+        for stack, samples in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += samples
+            for frame in set(frames):
+                total[frame] += samples
+        return [(name, samples * self.interval, total[name] * self.interval)
+                for name, samples in own.most_common(count) if name]
+
+
+def hottest_cprofile(profile, count=10):
+    """(function, self seconds, total seconds) sorted by self time"""
+    stats = pstats.Stats(profile).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [(f"{func} ({os.path.basename(file)}:{line})", tottime, cumtime)
+            for (file, line, func), (_, _, tottime, cumtime, _)
+            in rows[:count]]
+
+
+def profile_day(day, text, profiler="cprofile", out_dir="profiles",
+                interval=0.001, count=10):
+    """Profile each stage of a day, writing a file per stage to out_dir
+
+    cprofile writes pstats (.prof) files, sample writes collapsed stacks
+    (.collapsed) for flamegraphs. Returns the hottest functions by stage.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    day_module = module(day)
+    stages = [("parse", lambda text: load(day_module, text))]
+    stages += [(name, getattr(day_module, name))
+               for name in ("part1", "part2")]
+    hottest = {}
+    data = text
+    for name, func in stages:
+        path = os.path.join(out_dir, f"day{day:02}-{name}")
+        if profiler == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                result = profile.runcall(func, data)
+            except NotImplementedError:
+                continue
+            profile.dump_stats(f"{path}.prof")
+            hottest[name] = hottest_cprofile(profile, count)
+        else:
+            sampler = Sampler(interval)
+            try:
+                result = sampler.runcall(func, data)
+            except NotImplementedError:
+                continue
+            sampler.dump_collapsed(f"{path}.collapsed")
+            hottest[name] = sampler.hottest(count)
+        if name == "parse":
+            data = result
+    return hottest
+
+
+def import_times(name, runs=3):
+    """(module, self seconds, cumulative seconds) from -X importtime
+
+    Only name and what it pulls in are reported, not interpreter startup.
+    Each import is timed in a fresh interpreter, keeping the fastest of
+    runs to smooth out noise. The imported module itself comes first.
+    """
+    best = {}
+    for _ in range(runs):
+        report = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {name}"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stderr
+        block = []
+        for line in report.splitlines()[1:]:
+            fields = line.removeprefix("import time:").split("|")
+            own, cumulative, imported = fields
+            block.append(
+                (imported.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+            # Children are listed before the module that imported them
+            if imported.startswith("  "):
+                continue
+            if imported.strip() == name:
+                break
+            block = []
+        for imported, *times in block:
+            best[imported] = min(best.get(imported, times), times)
+    rows = sorted(((imported, *times) for imported, times in best.items()),
+                  key=lambda row: row[2], reverse=True)
+    return [row for row in rows if row[0] == name] + \
+        [row for row in rows if row[0] != name]
+
+
+def test_import_budget():
+    import warnings
+    for name in discover().values():
+        times = import_times(name, runs=5)
+        imported, _, cumulative = times[0]
+        assert imported == name
+        if cumulative >= IMPORT_BUDGET:
+            warnings.warn(f"{name} took {cumulative:.3f}s to import, over "
+                          f"the {IMPORT_BUDGET}s budget: {times[:5]}")
+        heavy = [row[0] for row in times
+                 if row[0].split(".")[0] in HEAVY_IMPORTS]
+        assert not heavy, f"{name} imports {heavy}"
+
+
+def test_profile_day(tmp_path):
+    # day01 imports numpy on first use, which would swamp its own functions
+    import numpy  # noqa: F401
+    text = module(1).TEST1
+    hottest = profile_day(1, text, out_dir=tmp_path)
+    assert set(hottest) == {"parse", "part1", "part2"}
+    assert (tmp_path / "day01-part2.prof").exists()
+    assert any(name.startswith("dial_counts ")
+               for name, _, _ in hottest["part1"])
+
+
+def test_sampler():
+    sampler = Sampler(interval=0.0005)
+    sampler.runcall(lambda: sum(i * i for i in range(300_000)))
+    assert sampler.stacks
+    assert all(stack.startswith("<lambda>") for stack in sampler.stacks)